@@ -5,7 +5,9 @@
     :author:    PiloeGAO (Leo DEPOIX)
     :version:   0.0.4
 """
-import sys, os, shutil, subprocess
+import sys, os, shutil, subprocess, time
+
+from .workerPool import WorkerPool
 
 def makeFolder(path):
     """Build a folder.
@@ -27,6 +29,100 @@ def makeFolder(path):
     else:
         return False
 
+def makeFolders(paths, maxWorkers=8, dryRun=False):
+    """Build many folders, each folder is checked and created only once.
+
+    Folders are checked from the top of the tree, the content of a missing folder
+    is known to be missing without checking it. Missing trees are created in parallel.
+
+    Args:
+        paths (list): Folders paths.
+        maxWorkers (int, optional): Maximum number of folders checked or created at the same time. Defaults to 8.
+        dryRun (bool, optional): Only report folders that would be created. Defaults to False.
+
+    Returns:
+        dict: Report with "created" (list), "existing" (int), "errors" (dict), "duration" (float) and "dryRun" (bool).
+    """
+    startTime = time.time()
+    pool = WorkerPool(maxWorkers=maxWorkers)
+
+    # Get every unique folder with its parents.
+    folders = set()
+    children = {}
+    for path in paths:
+        if(path == ""):
+            continue
+
+        folder = os.path.normpath(path)
+        while(folder not in folders):
+            folders.add(folder)
+            parent = os.path.dirname(folder)
+            if(parent == folder or parent == ""):
+                break
+            children.setdefault(parent, []).append(folder)
+            folder = parent
+
+    # Check existing folders level by level, starting from the roots.
+    existing = 0
+    missingRoots = []
+    level = [folder for folder in folders if os.path.dirname(folder) not in folders or os.path.dirname(folder) == folder]
+    while(len(level) > 0):
+        nextLevel = []
+        for folder, (isFolder, error) in zip(level, pool.map(os.path.isdir, level)):
+            if(isFolder):
+                existing += 1
+                nextLevel += children.get(folder, [])
+            else:
+                missingRoots.append(folder)
+        level = nextLevel
+
+    # Each missing tree is created by a single worker, parents first.
+    def missingTree(root):
+        tree = [root]
+        for folder in tree:
+            tree += children.get(folder, [])
+        return tree
+
+    trees = [missingTree(root) for root in missingRoots]
+    created = []
+    errors = {}
+
+    if(dryRun):
+        for tree in trees:
+            created += tree
+    else:
+        def makeTree(tree):
+            treeCreated = []
+            treeErrors = {}
+            for folder in tree:
+                if(os.path.dirname(folder) in treeErrors):
+                    treeErrors[folder] = treeErrors[os.path.dirname(folder)]
+                    continue
+
+                try:
+                    os.mkdir(folder)
+                except OSError as error:
+                    treeErrors[folder] = error
+                else:
+                    treeCreated.append(folder)
+            return treeCreated, treeErrors
+
+        for tree, (result, error) in zip(trees, pool.map(makeTree, trees)):
+            if(error != None):
+                errors[tree[0]] = error
+                continue
+
+            created += result[0]
+            errors.update(result[1])
+
+    return {
+        "created": sorted(created),
+        "existing": existing,
+        "errors": errors,
+        "duration": time.time() - startTime,
+        "dryRun": dryRun
+    }
+
 def copyFile(filePath, targetPath, **kwargs):
     """Copy a file from a directory to another.
 
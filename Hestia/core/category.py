@@ -5,6 +5,7 @@
     :author:    PiloeGAO (Leo DEPOIX)
     :version:   0.0.4
 """
+import threading
 
 class Category():
     """Category class.
@@ -14,6 +15,7 @@ class Category():
         name (str, optional): Catgeory's name. Defaults to "".
         description (str, optional): Category's description. Defaults to "".
         type (str, optional): Category's type (must be "Assets" or "Shots"). Defaults to "".
+        loader (function, optional): Function called with the category to load its entities on first access. Defaults to None.
     """
     def __init__(self, id="", name="", description="", type="", **kwargs):
         self.__id               = id
@@ -25,6 +27,14 @@ class Category():
 
         self.__entities         = []
 
+        # Project owning the category, used to keep its indexes updated.
+        self.__project          = None
+
+        # Lazy loading of entities.
+        self.__loader           = kwargs["loader"] if "loader" in kwargs else None
+        self.__loaded           = self.__loader == None
+        self.__loadingLock      = threading.Lock()
+
     @property
     def id(self):
         """Get the id of the category.
@@ -90,11 +100,12 @@ class Category():
     
     @property
     def entities(self):
-        """Get the entities stored in the category.
+        """Get the entities stored in the category, load them on first access.
 
         Returns:
             list: Category's entities.
         """
+        self.load()
         return self.__entities
     
     @entities.setter
@@ -104,7 +115,89 @@ class Category():
         Args:
             entities (list): Category's entities.
         """
+        oldEntities = self.__entities
         self.__entities = entities
+        self.__loaded = True
+
+        if(self.__project != None):
+            for entity in oldEntities:
+                self.__project.unindexEntity(entity)
+
+            for entity in entities:
+                self.__project.indexEntity(entity, self)
+    
+    @property
+    def project(self):
+        """Get the project of the category.
+
+        Returns:
+            class: "Project": Project.
+        """
+        return self.__project
+    
+    @project.setter
+    def project(self, project):
+        """Set the project of the category.
+
+        Args:
+            project (class: "Project"): Project.
+        """
+        self.__project = project
+    
+    @property
+    def loader(self):
+        """Get the function used to load entities.
+
+        Returns:
+            function: Loader function.
+        """
+        return self.__loader
+    
+    @loader.setter
+    def loader(self, loader):
+        """Set the function used to load entities, entities will be loaded on next access.
+
+        Args:
+            loader (function): Function called with the category, returns False if the loading failed.
+        """
+        self.__loader = loader
+        self.__loaded = loader == None
+    
+    @property
+    def loaded(self):
+        """Get the loading status of entities.
+
+        Returns:
+            bool: Is entities loaded.
+        """
+        return self.__loaded
+    
+    def load(self):
+        """Load entities with the loader if not already done.
+        A failed loading is done again on next access.
+
+        Returns:
+            bool: Is entities loaded.
+        """
+        if(self.__loaded):
+            return True
+
+        with self.__loadingLock:
+            if(not self.__loaded):
+                status = False
+                try:
+                    status = self.__loader(self) != False
+                finally:
+                    if(not status):
+                        # Remove entities added before the failure, the next loading starts from scratch.
+                        if(self.__project != None):
+                            for entity in self.__entities:
+                                self.__project.unindexEntity(entity)
+                        self.__entities = []
+
+                self.__loaded = status
+        
+        return self.__loaded
     
     def addEntity(self, entity):
         """Add an entity to the category.
@@ -112,4 +205,19 @@ class Category():
         Args:
             entity (class: "Entity"): New entity to add.
         """
-        self.__entities.append(entity)
\ No newline at end of file
+        self.__entities.append(entity)
+
+        if(self.__project != None):
+            self.__project.indexEntity(entity, self)
+    
+    def removeEntity(self, entity):
+        """Remove an entity from the category.
+
+        Args:
+            entity (class: "Entity"): Entity to remove.
+        """
+        if(entity in self.__entities):
+            self.__entities.remove(entity)
+
+            if(self.__project != None):
+                self.__project.unindexEntity(entity)
\ No newline at end of file
@@ -31,8 +31,11 @@ class Entity():
 
         self.__iconDownloaded = False
         self.__icon         = icon
+        self.__resizedIcons = {}
         self.__tasks        = tasks
-        self.__versions     = versions
+        self.__versions     = []
+        self.__lastRevisions = {}
+        self.versions       = versions
         
         # Shot specific datas.
         self.__frameNumber = int(kwargs["frameNumber"]) if "frameNumber" in kwargs else 0
@@ -109,7 +112,7 @@ class Entity():
         """
         # Download the preview if not local.
         if(not self.__iconDownloaded):
-            self.__icon = self.__manager.link.downloadPreview(entityType=self.__type, entityId=self.__id)
+            self.__icon = self.__manager.link.downloadPreview(entityType=self.__type, entityId=self.__id, entityData=self.__rawDatas)
             self.__iconDownloaded = True
         
         return self.__icon
@@ -124,6 +127,49 @@ class Entity():
         self.__icon = icon
         self.__iconDownloaded = True
     
+    def getIcon(self, size=None):
+        """Get the icon of the entity downsampled for a display size.
+
+        Args:
+            size (int, optional): Display size in pixels, None for the full size icon. Defaults to None.
+
+        Returns:
+            str: The icon of the entity.
+        """
+        if(size == None):
+            return self.icon
+
+        if(size not in self.__resizedIcons):
+            self.__resizedIcons[size] = self.__manager.link.downloadPreview(entityType=self.__type, entityId=self.__id, entityData=self.__rawDatas, size=size)
+
+        return self.__resizedIcons[size]
+    
+    def setIcon(self, icon, size=None):
+        """Set the icon of the entity for a display size.
+
+        Args:
+            icon (str): The icon of the entity.
+            size (int, optional): Display size in pixels, None for the full size icon. Defaults to None.
+        """
+        if(size == None):
+            self.icon = icon
+        else:
+            self.__resizedIcons[size] = icon
+    
+    def isIconLoaded(self, size=None):
+        """Get the icon status for a display size.
+
+        Args:
+            size (int, optional): Display size in pixels, None for the full size icon. Defaults to None.
+
+        Returns:
+            bool: Icon status.
+        """
+        if(size == None):
+            return self.__iconDownloaded
+
+        return size in self.__resizedIcons
+    
     @property
     def tasks(self):
         """Get tasks of the entity.
@@ -133,6 +179,15 @@ class Entity():
         """
         return self.__tasks
     
+    @tasks.setter
+    def tasks(self, tasks):
+        """Set tasks of the entity.
+
+        Args:
+            tasks (list: class:`Task`): Task of the entity.
+        """
+        self.__tasks = tasks
+    
     @property
     def versions(self):
         """Get versions of the entity.
@@ -149,7 +204,44 @@ class Entity():
         Args:
             versions (list): Versions of the entity
         """
-        self.__versions = versions
+        self.__versions = list(versions)
+
+        # Highest revision number by task ID.
+        self.__lastRevisions = {}
+        for version in self.__versions:
+            self.updateLastRevision(version)
+    
+    def addVersion(self, version):
+        """Add a version to the entity.
+
+        Args:
+            version (class: "Version"): New version.
+        """
+        self.__versions.append(version)
+        self.updateLastRevision(version)
+    
+    def updateLastRevision(self, version):
+        """Update the highest revision number of the version's task.
+
+        Args:
+            version (class: "Version"): Version.
+        """
+        if(version.task == None):
+            return
+
+        if(version.revisionNumber > self.__lastRevisions.get(version.task.id, 0)):
+            self.__lastRevisions[version.task.id] = version.revisionNumber
+    
+    def getLastRevision(self, taskId):
+        """Get the highest revision number published for a task.
+
+        Args:
+            taskId (str): Task's ID.
+
+        Returns:
+            int: Revision number, 0 if nothing was published.
+        """
+        return self.__lastRevisions.get(taskId, 0)
     
     # Shot specific datas.
     @property
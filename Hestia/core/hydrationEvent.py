@@ -0,0 +1,56 @@
+"""
+    :package:   Hestia
+    :file:      hydrationEvent.py
+    :brief:     Events sent while a project is built.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+
+class HydrationEvent():
+    """Hydration event class, sent each time a piece of a project is ready.
+
+    Items are already added to their parent when the event is sent.
+
+    Args:
+        type (str): Event type, one of the class event types.
+        item (object): Project, task, category, entity or versions list.
+        parent (object, optional): Project, category or entity holding the item. Defaults to None.
+    """
+    # Event types.
+    projectCreated      = "projectCreated"
+    taskAdded           = "taskAdded"
+    categoryAdded       = "categoryAdded"
+    entityAdded         = "entityAdded"
+    versionsAttached    = "versionsAttached"
+
+    def __init__(self, type, item, parent=None):
+        self.__type     = type
+        self.__item     = item
+        self.__parent   = parent
+
+    @property
+    def type(self):
+        """Get the event type.
+
+        Returns:
+            str: Event type.
+        """
+        return self.__type
+
+    @property
+    def item(self):
+        """Get the item ready.
+
+        Returns:
+            object: Project, task, category, entity or versions list.
+        """
+        return self.__item
+
+    @property
+    def parent(self):
+        """Get the parent of the item.
+
+        Returns:
+            object: Project (tasks and categories), category (entities) or entity (versions), None for projects.
+        """
+        return self.__parent
@@ -40,11 +40,58 @@ class DefaultWrapper(object):
         """
         return NotImplementedError
     
-    def getDatasFromProject(self, project):
+    def getDatasFromProject(self, project, forceResync=False):
         """Get data for the selected project.
 
         Args:
             project (str): Project datas.
+            forceResync (bool, optional): Ignore the project snapshot. Defaults to False.
+
+        Returns:
+            NotImplementedError: Projects not implemented.
+        """
+        return NotImplementedError
+    
+    def buildProject(self, project):
+        """Build a project with metadatas only.
+
+        Args:
+            project (str): Project datas.
+
+        Returns:
+            NotImplementedError: Projects not implemented.
+        """
+        return NotImplementedError
+    
+    def loadProjectDatas(self, newProject, forceResync=False):
+        """Load tasks, categories and entities of a project.
+
+        Args:
+            newProject (class: "Project"): Project to fill.
+            forceResync (bool, optional): Ignore the project snapshot. Defaults to False.
+
+        Returns:
+            NotImplementedError: Projects not implemented.
+        """
+        return NotImplementedError
+    
+    def syncProject(self, project):
+        """Update a project with the latest online changes.
+
+        Args:
+            project (class: "Project"): Project to update.
+
+        Returns:
+            NotImplementedError: Projects not implemented.
+        """
+        return NotImplementedError
+    
+    def refreshEntity(self, project, entity):
+        """Update an entity with the latest online datas.
+
+        Args:
+            project (class: "Project"): Project of the entity.
+            entity (class: "Entity"): Entity to update.
 
         Returns:
             NotImplementedError: Projects not implemented.
@@ -0,0 +1,238 @@
+"""
+    :package:   Hestia
+    :file:      kitsuAdapter.py
+    :brief:     HTTP adapter of the Kitsu session.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import re, time
+import threading
+
+from collections import OrderedDict
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+
+from ....core.rateLimiter import RateLimiter
+
+class KitsuAdapter(HTTPAdapter):
+    """Kitsu adapter class, throttle requests and revalidate JSON responses with conditional requests.
+
+    Connections are kept alive in a pool shared by every thread of the session,
+    the pool blocks when full so no connection is opened outside of it.
+
+    Every request waits for the rate limiter, idempotent requests failing
+    with a connection error, a 429 or a 5xx are retried after a jittered backoff.
+
+    Validators (ETag and Last-Modified) and bodies of JSON responses are kept by URL.
+    Next GET requests on the same URL send them, an unchanged response
+    is answered by the server with a 304 and rebuilt from the stored body.
+    Responses without validators are never stored.
+
+    Args:
+        maxSize (int, optional): Maximum size of the stored bodies in bytes. Defaults to 50MB.
+        conditionalRequests (bool, optional): Revalidate GET requests. Defaults to True.
+        limiter (class: "RateLimiter", optional): Rate limiter of the requests. Defaults to None.
+        maxRetries (int, optional): Number of retries of a failed request. Defaults to 4.
+        poolSize (int, optional): Maximum number of connections kept alive by host. Defaults to 16.
+        timeout (tuple, optional): Connect and read timeouts in seconds, used if the request has none. Defaults to (10, 60).
+    """
+    # Methods safe to send again after a failure.
+    idempotentMethods = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+    def __init__(self, maxSize=50 * 1024 * 1024, conditionalRequests=True, limiter=None, maxRetries=4, poolSize=16, timeout=(10, 60), **kwargs):
+        super(KitsuAdapter, self).__init__(pool_connections=4, pool_maxsize=max(1, int(poolSize)), pool_block=True, **kwargs)
+        self.__timeout = timeout
+        self.__maxSize = int(maxSize)
+        self.__conditionalRequests = conditionalRequests
+        self.__limiter = limiter if limiter != None else RateLimiter()
+        self.__maxRetries = max(0, int(maxRetries))
+
+        self.__lock = threading.Lock()
+        # Responses by URL: [etag, last modified, body, encoding].
+        self.__responses = OrderedDict()
+        self.__size = 0
+
+        # Counters by endpoint: requests, not modified and bytes saved.
+        self.__stats = {}
+
+    @property
+    def limiter(self):
+        """Get the rate limiter of the requests.
+
+        Returns:
+            class: "RateLimiter": Rate limiter.
+        """
+        return self.__limiter
+
+    @property
+    def stats(self):
+        """Get the conditional requests counters.
+
+        Returns:
+            dict: Counters ("requests", "notModified" and "bytesSaved") by endpoint.
+        """
+        with self.__lock:
+            return dict([(endpoint, dict(counters)) for endpoint, counters in self.__stats.items()])
+
+    def getEndpoint(self, url):
+        """Get the endpoint of an URL, IDs are replaced to group requests.
+
+        Args:
+            url (str): Request URL.
+
+        Returns:
+            str: Endpoint (example: "data/projects/:id/asset-types").
+        """
+        path = url.split("?", 1)[0].split("://", 1)[-1]
+        path = path.split("/api/", 1)[-1]
+        return re.sub("[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}", ":id", path)
+
+    def send(self, request, **kwargs):
+        """Send a request, GET requests are revalidated if a response is stored.
+
+        Args:
+            request (class: "requests.PreparedRequest"): Request.
+
+        Returns:
+            class: "requests.Response": Response.
+        """
+        if(not self.__conditionalRequests or request.method != "GET" or kwargs.get("stream", False)):
+            return self.sendWithRetries(request, **kwargs)
+
+        with self.__lock:
+            stored = self.__responses.get(request.url, None)
+
+        if(stored != None):
+            if(stored[0] != None):
+                request.headers["If-None-Match"] = stored[0]
+            if(stored[1] != None):
+                request.headers["If-Modified-Since"] = stored[1]
+
+        response = self.sendWithRetries(request, **kwargs)
+
+        endpoint = self.getEndpoint(request.url)
+        with self.__lock:
+            counters = self.__stats.setdefault(endpoint, {"requests": 0, "notModified": 0, "bytesSaved": 0})
+            counters["requests"] += 1
+
+        if(response.status_code == 304 and stored != None):
+            # Unchanged, the connection is given back to the pool before the stored body is used as response.
+            self.releaseConnection(response)
+
+            response.status_code = 200
+            response.reason = "OK"
+            response._content = stored[2]
+            response.encoding = stored[3]
+
+            with self.__lock:
+                counters["notModified"] += 1
+                counters["bytesSaved"] += len(stored[2])
+                if(request.url in self.__responses):
+                    # Move the response to the most recently used end.
+                    self.__responses[request.url] = self.__responses.pop(request.url)
+
+            return response
+
+        if(response.status_code == 200):
+            self.storeResponse(request.url, response)
+
+        return response
+
+    def sendWithRetries(self, request, **kwargs):
+        """Send a request through the rate limiter, retried while the server is overloaded.
+
+        Args:
+            request (class: "requests.PreparedRequest"): Request.
+
+        Returns:
+            class: "requests.Response": Response.
+        """
+        if(kwargs.get("timeout", None) == None):
+            kwargs["timeout"] = self.__timeout
+
+        attempt = 0
+        while True:
+            self.__limiter.acquire()
+            start = time.time()
+            try:
+                response = super(KitsuAdapter, self).send(request, **kwargs)
+            except (ConnectionError, Timeout) as error:
+                self.__limiter.release(overloaded=True, latency=time.time() - start)
+                if(attempt >= self.__maxRetries or request.method not in self.idempotentMethods):
+                    raise
+
+                delay = self.__limiter.getBackoff(attempt)
+                self.__limiter.log("%s %s failed (%s), retry in %.2fs." % (request.method, self.getEndpoint(request.url), error, delay))
+            else:
+                overloaded = response.status_code == 429 or response.status_code >= 500
+                self.__limiter.release(overloaded=overloaded, latency=time.time() - start)
+                if(not overloaded or attempt >= self.__maxRetries or request.method not in self.idempotentMethods):
+                    return response
+
+                try:
+                    retryAfter = float(response.headers.get("Retry-After", None))
+                except (TypeError, ValueError):
+                    retryAfter = None
+
+                delay = self.__limiter.getBackoff(attempt, retryAfter=retryAfter)
+                self.__limiter.log("%s %s returned %i, retry in %.2fs." % (request.method, self.getEndpoint(request.url), response.status_code, delay))
+                self.releaseConnection(response)
+
+            time.sleep(delay)
+            attempt += 1
+
+    def releaseConnection(self, response):
+        """Read the body of an unused response and give its connection back to the pool.
+
+        The pool blocks when full, a connection never released blocks every next request.
+        Closing the response would also free its slot but the next request would open a new connection.
+
+        Args:
+            response (class: "requests.Response"): Response.
+        """
+        try:
+            response.raw.read(decode_content=False)
+        except Exception:
+            # Broken connection, closed instead of reused.
+            response.raw.close()
+        finally:
+            response.raw.release_conn()
+
+    def storeResponse(self, url, response):
+        """Store the validators and the body of a JSON response.
+
+        Args:
+            url (str): Request URL.
+            response (class: "requests.Response"): Response.
+        """
+        etag = response.headers.get("ETag", None)
+        lastModified = response.headers.get("Last-Modified", None)
+
+        with self.__lock:
+            if(url in self.__responses):
+                self.__size -= len(self.__responses.pop(url)[2])
+
+        if((etag == None and lastModified == None)
+            or not response.headers.get("Content-Type", "").startswith("application/json")):
+            return
+
+        body = response.content
+        if(len(body) > self.__maxSize):
+            return
+
+        with self.__lock:
+            self.__responses[url] = [etag, lastModified, body, response.encoding]
+            self.__size += len(body)
+
+            # Remove least recently used responses.
+            while(self.__size > self.__maxSize):
+                oldUrl, oldResponse = self.__responses.popitem(last=False)
+                self.__size -= len(oldResponse[2])
+
+    def clear(self):
+        """Remove all stored responses.
+        """
+        with self.__lock:
+            self.__responses = OrderedDict()
+            self.__size = 0
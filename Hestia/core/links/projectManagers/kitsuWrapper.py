@@ -5,10 +5,20 @@
     :author:    PiloeGAO (Leo DEPOIX)
     :version:   0.0.4
 """
-import os, json, sys
+import os, json, sys, hashlib
+import threading
 import gazu
 
 from .defaultWrapper    import DefaultWrapper
+from .kitsuAdapter      import KitsuAdapter
+from ....core.workerPool import WorkerPool
+from ....core.hydrationEvent import HydrationEvent
+from ....core.snapshot  import ProjectSnapshot
+from ....core.thumbnailCache import ThumbnailCache
+from ....core.requestCache import RequestCache
+from ....core.rateLimiter import RateLimiter
+from ....core               import thumbnailPyramid
+from ....core               import thumbnailAtlas
 from ....core.project   import Project
 from ....core.task      import Task
 from ....core.category  import Category
@@ -32,7 +42,87 @@ class KitsuWrapper(DefaultWrapper):
 
         self.__debugKitsuData = False
 
+        # Number of ids sent in a single filtered query.
+        self.__bulkChunkSize = 100
+
         self._loadPreviews = bool(int(self.__manager.preferences.getValue("MANAGER", "loadPreviews")))
+        self._bulkLoading = bool(int(self.__manager.preferences.getValue("MANAGER", "bulkLoading")))
+        self._lazyLoading = bool(int(self.__manager.preferences.getValue("MANAGER", "lazyLoading")))
+
+        # Project snapshots stored on disk.
+        self._useSnapshots = bool(int(self.__manager.preferences.getValue("MANAGER", "useSnapshots")))
+        self.__snapshotsFolder = os.path.expanduser("~") + os.sep + ".hestia" + os.sep + "snapshots"
+        self.__syncEventsLimit = 5000
+
+        # Entities IDs by category ID for each snapshot path, used by lazy loading.
+        self.__snapshotIndexes = {}
+        self.__snapshotIndexesLock = threading.Lock()
+
+        # Previews shared by every session, size is stored in MB.
+        thumbnailsFolder = self.__manager.preferences.getValue("MANAGER", "thumbnailsCacheFolder")
+        if(thumbnailsFolder == ""):
+            thumbnailsFolder = os.path.expanduser("~") + os.sep + ".hestia" + os.sep + "thumbnails"
+        self.__thumbnailCache = ThumbnailCache(path=thumbnailsFolder,
+                                                maxSize=float(self.__manager.preferences.getValue("MANAGER", "thumbnailsCacheSize")) * 1024 * 1024)
+
+        # Preview files datas by ID, resolved by category.
+        self.__previewFiles = {}
+        # Download status of the previews datas by category ID.
+        self.__previewsCategories = {}
+        self.__previewFilesLock = threading.Lock()
+
+        # Pool used to fetch entities datas in parallel.
+        self.__workerPool = WorkerPool(maxWorkers=int(self.__manager.preferences.getValue("MANAGER", "fetchWorkers")))
+
+        # Results of read requests by endpoint, time to live are in seconds and size is stored in MB.
+        self.__requestCache = RequestCache(maxSize=float(self.__manager.preferences.getValue("MANAGER", "requestsCacheSize")) * 1024 * 1024,
+                                            defaultTtl=60,
+                                            ttls={
+                                                "projects": 300,
+                                                "task-types": 3600,
+                                                "task-status": 3600,
+                                                "asset-types": 600,
+                                                "sequences": 300,
+                                                "assets": 120,
+                                                "shots": 120,
+                                                "entities": 120,
+                                                "casting": 120,
+                                                "tasks": 60,
+                                                "output-files": 30,
+                                                "working-files": 60,
+                                                "preview-files": 600,
+                                                "output-types": 3600,
+                                                "softwares": 3600
+                                            })
+
+        # Requests sent to Zou are throttled, the server is shared by every instance of the studio.
+        preferences = self.__manager.preferences
+        limiter = RateLimiter(rate=float(preferences.getValue("MANAGER", "requestsRate")),
+                                burst=int(preferences.getValue("MANAGER", "requestsBurst")),
+                                maxConcurrency=int(preferences.getValue("MANAGER", "requestsMaxConcurrency")),
+                                latencyLimit=float(preferences.getValue("MANAGER", "requestsLatencyLimit")),
+                                backoff=float(preferences.getValue("MANAGER", "requestsBackoff")),
+                                maxBackoff=float(preferences.getValue("MANAGER", "requestsMaxBackoff")),
+                                logging=self.__manager.logging)
+        self.__manager.logging.debug("Requests limits: %s/s (burst %s), %s at the same time, %s retries." % (preferences.getValue("MANAGER", "requestsRate"),
+                                                                                                        preferences.getValue("MANAGER", "requestsBurst"),
+                                                                                                        preferences.getValue("MANAGER", "requestsMaxConcurrency"),
+                                                                                                        preferences.getValue("MANAGER", "requestsRetries")))
+
+        # Connections are shared by the fetch workers, the previews downloads and the publisher,
+        # the pool holds a connection for each of them to never open a new one after warm-up.
+        poolSize = max(int(preferences.getValue("MANAGER", "requestsPoolSize")),
+                        int(preferences.getValue("MANAGER", "fetchWorkers")) + int(preferences.getValue("MANAGER", "previewWorkers")) + 1)
+
+        # Validators of JSON responses, unchanged listings are revalidated with a 304.
+        self.__httpAdapter = KitsuAdapter(maxSize=float(preferences.getValue("MANAGER", "requestsCacheSize")) * 1024 * 1024,
+                                            conditionalRequests=bool(int(preferences.getValue("MANAGER", "conditionalRequests"))),
+                                            limiter=limiter,
+                                            maxRetries=int(preferences.getValue("MANAGER", "requestsRetries")),
+                                            poolSize=poolSize,
+                                            timeout=(float(preferences.getValue("MANAGER", "requestsConnectTimeout")),
+                                                    float(preferences.getValue("MANAGER", "requestsReadTimeout"))))
+        self.__manager.logging.debug("Requests pool: %i connections kept alive." % poolSize)
     
     @property
     def api(self):
@@ -67,6 +157,8 @@ class KitsuWrapper(DefaultWrapper):
         else:
             self.__active = True
 
+        self.mountHttpAdapter()
+
         try:
             gazu.log_in(username, password)
         except gazu.exception.AuthFailedException:
@@ -76,8 +168,9 @@ class KitsuWrapper(DefaultWrapper):
             self._username = username + " (Online Mode: Kitsu)"
             self.__userID = gazu.client.get_current_user()["id"]
 
-            # Enable caching for faster download from online.
-            gazu.cache.enable()
+            # Results of the previous user can't be used.
+            self.__requestCache.clear()
+            self.__httpAdapter.clear()
 
             return True
     
@@ -91,19 +184,54 @@ class KitsuWrapper(DefaultWrapper):
         if(self.__active == False):
             return ConnectionError
         
-        return gazu.project.all_open_projects()
+        return self.fetch("projects", gazu.project.all_open_projects)
     
-    def getDatasFromProject(self, project):
+    def getDatasFromProject(self, project, forceResync=False):
         """Get data for the selected project.
 
         Args:
             project (str): Project datas.
+            forceResync (bool, optional): Ignore the project snapshot and download everything. Defaults to False.
 
         Returns:
             class: "Project": Project generated from kitsu.
         """
-        self.__manager.logging.info("Getting datas for: %s" % project["name"])
+        newProject = None
+        for event in self.streamProject(project, forceResync=forceResync):
+            if(event.type == HydrationEvent.projectCreated):
+                newProject = event.item
+
+        if(self.__manager.debug):
+            for endpoint, counters in sorted(self.__httpAdapter.stats.items()):
+                self.__manager.logging.debug("%s : %i requests, %i not modified, %i bytes saved." % (endpoint, counters["requests"], counters["notModified"], counters["bytesSaved"]))
 
+        return newProject
+    
+    def streamProject(self, project, forceResync=False):
+        """Build a project and yield an event each time a piece of it is ready.
+
+        Args:
+            project (dict): Project datas.
+            forceResync (bool, optional): Ignore the project snapshot and download everything. Defaults to False.
+
+        Yields:
+            class: "HydrationEvent": Project created, then the events of "streamProjectDatas".
+        """
+        newProject = self.buildProject(project)
+        yield HydrationEvent(HydrationEvent.projectCreated, newProject)
+
+        for event in self.streamProjectDatas(newProject, forceResync=forceResync):
+            yield event
+    
+    def buildProject(self, project):
+        """Build a project with metadatas only (no tasks, categories or entities).
+
+        Args:
+            project (dict): Project datas.
+
+        Returns:
+            class: "Project": Project generated from kitsu.
+        """
         # Setup project variables.
         description             = project["description"] if project["description"] != None else ""
         fps                     = project["fps"] if project["fps"] != None else 0
@@ -133,73 +261,676 @@ class KitsuWrapper(DefaultWrapper):
                             workingFilenameShot=workingFilenameShot,
                             workingFolderPathAsset=workingFolderPathAsset,
                             workingFolderPathShot=workingFolderPathShot,
+                            lazy=self._lazyLoading,
                             rawDatas=project)
 
+        for error in newProject.templatesErrors:
+            self.__manager.logging.warning("%s : %s, kept as written in paths." % (project["name"], error))
+
         if(self.__manager.debug and self.__debugKitsuData):
             self.__manager.logging.debug(json.dumps(project, sort_keys=True, indent=4))
         
+        return newProject
+    
+    def loadProjectDatas(self, newProject, forceResync=False):
+        """Get, create and add tasks, categories and entities to a project.
+
+        Args:
+            newProject (class: "Project"): Project built with "buildProject".
+            forceResync (bool, optional): Ignore the project snapshot and download everything. Defaults to False.
+        """
+        for event in self.streamProjectDatas(newProject, forceResync=forceResync):
+            pass
+    
+    def streamProjectDatas(self, newProject, forceResync=False):
+        """Get, create and add tasks, categories and entities to a project,
+        an event is yielded as soon as each of them is added.
+
+        In lazy mode, entities are not part of the stream, see "streamCategory".
+        With snapshots enabled, lazy categories are read from the project snapshot,
+        if the snapshot isn't usable it is built category by category while they are downloaded.
+
+        Args:
+            newProject (class: "Project"): Project built with "buildProject".
+            forceResync (bool, optional): Ignore the project snapshot and download everything. Defaults to False.
+
+        Yields:
+            class: "HydrationEvent": Task added, category added, entity added and versions attached events.
+        """
+        project = newProject.rawDatas
+
+        self.__manager.logging.info("Getting datas for: %s" % project["name"])
+
         # Get, create and add tasks to project.
-        tasks = gazu.task.all_task_types()
+        tasks = self.fetch("task-types", gazu.task.all_task_types)
 
         for task in tasks:
             taskType = "Assets" if task["for_shots"] == "false" else "Shots"
             newTask = Task(taskType=taskType, id=task["id"], name=task["name"], rawDatas=task)
             newProject.addTask(newTask)
+            yield HydrationEvent(HydrationEvent.taskAdded, newTask, newProject)
 
         if(self.__manager.debug and self.__debugKitsuData):
             self.__manager.logging.debug(json.dumps(tasks, sort_keys=True, indent=4))
         
         self.__manager.logging.info("Tasks loaded.")
+        self.__manager.reportLoading("tasks", len(tasks), len(tasks))
+
+        if(self.__manager.loadingCancelled):
+            return
 
         # Get, create and add categories to project.
-        categories = gazu.asset.all_asset_types_for_project(project)
+        categories = self.fetch("asset-types", gazu.asset.all_asset_types_for_project, project)
 
         for category in categories:
             newCategory = Category(id=category["id"], name=category["name"], description="", type="Assets", rawDatas=category)
             newProject.addCategory(newCategory)
+            yield HydrationEvent(HydrationEvent.categoryAdded, newCategory, newProject)
         
         if(self.__manager.debug and self.__debugKitsuData):
             self.__manager.logging.debug(json.dumps(categories, sort_keys=True, indent=4))
         
         self.__manager.logging.info("Categories loaded.")
 
-        # Get, create and add assets to categories.
-        assets = gazu.asset.all_assets_for_project(project)
+        # Get, create and add sequences to project.
+        sequences = self.fetch("sequences", gazu.shot.all_sequences_for_project, project)
+        for event in self.streamSequences(newProject, sequences):
+            yield event
+        
+        self.__manager.logging.info("Sequences loaded.")
+        self.__manager.reportLoading("categories", len(newProject.categories), len(newProject.categories))
 
-        for asset in assets:
-            # Get all datas for asset.
-            assetData = gazu.asset.get_asset(asset["id"])
-            
-            if(self.__manager.debug and self.__debugKitsuData):
-                self.__manager.logging.debug(json.dumps(assetData, sort_keys=True, indent=4))
-            
-            # Get tasks for asset.
-            assetTasks = []
-            for assetTask in gazu.task.all_task_types_for_asset(assetData):
-                assetTasks.append([task for task in newProject.tasks if task.id == assetTask["id"]][0])
-            
-            # Output versionning.
-            versions = self.getVersions(newProject, assetData)
-
-            # Buildint the Entity with all datas.
-            newAsset = Entity(manager=self.__manager,
-                                entityType="Assets",
-                                id=asset["id"],
-                                name=asset["name"],
-                                description=asset["description"],
-                                icon="",
-                                tasks=assetTasks,
-                                versions=versions,
-                                rawDatas=asset)
+        if(self.__manager.loadingCancelled):
+            return
+
+        if(self._lazyLoading):
+            snapshot = self.prepareLazySnapshot(newProject, forceResync=forceResync) if self._useSnapshots else None
+
+            # Entities will be loaded on first access of each category.
+            for category in newProject.categories:
+                category.loader = lambda category: self.loadCategory(newProject, category, snapshot=snapshot)
             
-            assetCategory = [category for category in newProject.categories if category.name == assetData["asset_type_name"]][0]
-            assetCategory.addEntity(newAsset)
+            return
+
+        if(self._useSnapshots):
+            # Get, create and add assets and shots from the project snapshot.
+            for event in self.streamSnapshotEntities(newProject, sequences, forceResync=forceResync):
+                yield event
+
+            self.__manager.logging.info("Assets and shots loaded.")
+
+            return
+
+        if(self._bulkLoading):
+            # Get, create and add assets and shots from project-wide queries.
+            for event in self.streamBulkEntities(newProject, self.getBulkDatasFromProject(project, sequences)):
+                yield event
+
+            self.__manager.logging.info("Assets and shots loaded.")
+
+            return
+
+        # Get, create and add assets to categories.
+        assets = self.fetch("assets", gazu.asset.all_assets_for_project, project)
+        for event in self.streamHydratedEntities(newProject, assets, self.hydrateAsset):
+            yield event
         
         self.__manager.logging.info("Assets loaded.")
 
-        # Get, create and add sequences to project.
-        sequences = gazu.shot.all_sequences_for_project(project)
+        if(self.__manager.loadingCancelled):
+            return
+
+        # Get, create and add shots to sequences.
+        shots = self.fetch("shots", gazu.shot.all_shots_for_project, project)
+        for event in self.streamHydratedEntities(newProject, shots, self.hydrateShot):
+            yield event
+
+        self.__manager.logging.info("Shots loaded.")
+    
+    def getSnapshot(self, project):
+        """Get the snapshot of a project, one file by Kitsu host and project.
+
+        Args:
+            project (dict): Project datas.
+
+        Returns:
+            class: "ProjectSnapshot": Snapshot.
+        """
+        key = hashlib.sha1(("%s|%s" % (self.__api, project["id"])).encode("utf-8")).hexdigest()
+        return ProjectSnapshot(path=self.__snapshotsFolder + os.sep + key + ".db")
+    
+    def clearSnapshots(self):
+        """Remove all project snapshots, next loading will download everything.
+        """
+        if(not os.path.isdir(self.__snapshotsFolder)):
+            return
+
+        for filename in os.listdir(self.__snapshotsFolder):
+            if(filename.endswith(".db")):
+                os.remove(self.__snapshotsFolder + os.sep + filename)
+        
+        self.__manager.logging.info("Project snapshots removed.")
+    
+    @property
+    def thumbnailCache(self):
+        """Get the previews cache.
+
+        Returns:
+            class: "ThumbnailCache": Previews cache.
+        """
+        return self.__thumbnailCache
+    
+    def clearThumbnailCache(self):
+        """Remove all cached previews, they will be downloaded again.
+        """
+        self.__thumbnailCache.clear()
+        self.__manager.logging.info("Previews cache cleared.")
+    
+    def streamSnapshotEntities(self, project, sequences, forceResync=False):
+        """Add assets and shots from the project snapshot, download them if the snapshot isn't usable.
+
+        Args:
+            project (class: "Project"): Project with tasks and categories already loaded.
+            sequences (list): Sequences datas.
+            forceResync (bool, optional): Ignore the snapshot and download everything. Defaults to False.
+
+        Yields:
+            class: "HydrationEvent": Entity added and versions attached events.
+        """
+        snapshot = self.getSnapshot(project.rawDatas)
+
+        if(forceResync or not snapshot.isValid):
+            self.__manager.logging.info("Downloading the full project snapshot.")
+
+            # Get the sync point before downloading to not miss changes made during the download.
+            lastEvent = self.getLastEventDate(project.rawDatas)
+            datas = self.getBulkDatasFromProject(project.rawDatas, sequences)
+            self.writeSnapshot(snapshot, datas, lastEvent)
+        else:
+            self.__manager.logging.info("Loading the project snapshot.")
+            datas = self.readSnapshot(snapshot)
+        
+        for event in self.streamBulkEntities(project, datas):
+            yield event
+    
+    def prepareLazySnapshot(self, project, forceResync=False):
+        """Get the snapshot used by the lazy loading of a project, start a new one if it isn't usable.
+
+        Args:
+            project (class: "Project"): Project with tasks and categories already loaded.
+            forceResync (bool, optional): Ignore the snapshot and download everything. Defaults to False.
+
+        Returns:
+            class: "ProjectSnapshot": Snapshot, None if it can't be built (bulk loading disabled).
+        """
+        snapshot = self.getSnapshot(project.rawDatas)
+        self.clearSnapshotIndex(snapshot)
+
+        if(not forceResync and snapshot.isValid):
+            self.__manager.logging.info("%s : Categories will be loaded from the project snapshot." % project.name)
+            return snapshot
+
+        if(not self._bulkLoading):
+            # Snapshots are written from bulk datas only.
+            return None
+
+        # Get the sync point before downloading to not miss changes made during the download.
+        self.__manager.logging.info("%s : Building the project snapshot with the categories." % project.name)
+        lastEvent = self.getLastEventDate(project.rawDatas)
+        snapshot.clear()
+        snapshot.setInfo("lastEvent", lastEvent)
+
+        return snapshot
+
+    def getSnapshotCategoryEntities(self, snapshot, category):
+        """Get the IDs of the entities of a category stored in a snapshot.
+
+        Args:
+            snapshot (class: "ProjectSnapshot"): Snapshot.
+            category (class: "Category"): Category.
+
+        Returns:
+            list: Entities IDs.
+        """
+        with self.__snapshotIndexesLock:
+            index = self.__snapshotIndexes.get(snapshot.path, None)
+            if(index == None):
+                index = {}
+                for asset in snapshot.getDatas("assets"):
+                    index.setdefault(asset["entity_type_id"], []).append(asset["id"])
+                for shot in snapshot.getDatas("shots"):
+                    index.setdefault(shot["parent_id"], []).append(shot["id"])
+                self.__snapshotIndexes[snapshot.path] = index
+
+        return index.get(category.id, [])
+
+    def clearSnapshotIndex(self, snapshot):
+        """Remove the entities index of a snapshot, called when the snapshot is modified.
+
+        Args:
+            snapshot (class: "ProjectSnapshot"): Snapshot.
+        """
+        with self.__snapshotIndexesLock:
+            self.__snapshotIndexes.pop(snapshot.path, None)
+
+    def writeCategorySnapshot(self, project, snapshot, category, datas):
+        """Add the bulk datas of a category to a snapshot being built,
+        the snapshot is complete once all the categories of the project are written.
+
+        Args:
+            project (class: "Project"): Project of the category.
+            snapshot (class: "ProjectSnapshot"): Snapshot.
+            category (class: "Category"): Category downloaded.
+            datas (dict): Datas from "getBulkDatasForEntities".
+        """
+        self.writeSnapshotDatas(snapshot, datas)
+        snapshot.setDatas("categories", [{"id": category.id}], entityKey=None)
+
+        if(len(snapshot.getDatas("categories")) >= len(project.categories)):
+            snapshot.setInfo("complete", 1)
+            self.__manager.logging.info("%s : Project snapshot complete." % project.name)
+
+    def getLastEventDate(self, project):
+        """Get the date of the last event of a project.
+
+        Args:
+            project (dict): Project datas.
+
+        Returns:
+            str: Event date, empty if the project doesn't have events.
+        """
+        events = gazu.sync.get_last_events(page_size=1, project=project)
+        return events[0]["created_at"] if len(events) > 0 else ""
+    
+    def writeSnapshot(self, snapshot, datas, lastEvent):
+        """Replace the content of a snapshot with bulk datas.
+
+        Args:
+            snapshot (class: "ProjectSnapshot"): Snapshot.
+            datas (dict): Datas from "getBulkDatasFromProject".
+            lastEvent (str): Date of the last event included in datas.
+        """
+        snapshot.clear()
+        self.clearSnapshotIndex(snapshot)
+        self.writeSnapshotDatas(snapshot, datas)
+        snapshot.setInfo("lastEvent", lastEvent)
+        snapshot.setInfo("complete", 1)
+    
+    def writeSnapshotDatas(self, snapshot, datas):
+        """Insert or replace bulk datas in a snapshot.
+
+        Args:
+            snapshot (class: "ProjectSnapshot"): Snapshot.
+            datas (dict): Datas from "getBulkDatasFromProject" or "getBulkDatasForEntities".
+        """
+        snapshot.setDatas("assets", datas["assets"])
+        snapshot.setDatas("shots", datas["shots"])
+        snapshot.setDatas("tasks", datas["tasks"], entityKey="entity_id")
+        snapshot.setDatas("outputFiles", datas["outputFiles"], entityKey="entity_id")
+        snapshot.setDatas("workingFiles", datas["workingFiles"], entityKey=None)
+        snapshot.setDatas("casting", [{"id": shotId, "assets": casting} for shotId, casting in datas["casting"].items()])
+    
+    def readSnapshot(self, snapshot, entityIds=None):
+        """Read bulk datas from a snapshot.
+
+        Args:
+            snapshot (class: "ProjectSnapshot"): Snapshot.
+            entityIds (list, optional): Only read datas of these entities. Defaults to None.
+
+        Returns:
+            dict: Datas with the same layout as "getBulkDatasFromProject".
+        """
+        datas = {
+            "assets": snapshot.getDatas("assets", ids=entityIds),
+            "shots": snapshot.getDatas("shots", ids=entityIds),
+            "tasks": snapshot.getDatas("tasks", entityIds=entityIds),
+            "outputFiles": snapshot.getDatas("outputFiles", entityIds=entityIds),
+            "casting": dict([(row["id"], row["assets"]) for row in snapshot.getDatas("casting", ids=entityIds)])
+        }
+
+        workingFilesIds = None
+        if(entityIds != None):
+            workingFilesIds = set([output["source_file_id"] for output in datas["outputFiles"] if output["source_file_id"] != None])
+        datas["workingFiles"] = snapshot.getDatas("workingFiles", ids=workingFilesIds)
+
+        return datas
+    
+    def syncProject(self, project):
+        """Patch a project loaded from its snapshot with the changes made on Kitsu since the snapshot.
+
+        Only assets, shots, tasks and output files updated since the last sync are downloaded,
+        entities using them are rebuilt in the project.
+
+        Args:
+            project (class: "Project"): Project loaded from a snapshot.
+
+        Returns:
+            bool: Sync status.
+        """
+        if(not self._useSnapshots):
+            return False
+
+        snapshot = self.getSnapshot(project.rawDatas)
+        if(not snapshot.isValid):
+            return False
+
+        lastEvent = snapshot.getInfo("lastEvent", "")
+        events = gazu.sync.get_last_events(page_size=self.__syncEventsLimit,
+                                            project=project.rawDatas,
+                                            after=lastEvent if lastEvent != "" else None)
+
+        if(len(events) == 0):
+            self.__manager.logging.info("%s : Snapshot up to date." % project.name)
+            return True
+        
+        if(len(events) >= self.__syncEventsLimit):
+            # Too many changes since last sync, download everything.
+            self.__manager.logging.info("%s : Too many changes, downloading the full project snapshot." % project.name)
+
+            sequences = [category.rawDatas for category in project.categories if category.type == "Shots"]
+            lastEvent = self.getLastEventDate(project.rawDatas)
+            datas = self.getBulkDatasFromProject(project.rawDatas, sequences)
+            self.writeSnapshot(snapshot, datas, lastEvent)
+
+            for category in project.loadedCategories:
+                category.entities = []
+            self.addBulkEntitiesToProject(project, self.filterLoadedEntities(project, datas))
+
+            return True
+        
+        # Sort changed and removed datas from events.
+        eventKinds = {
+            "asset": ("assets", "asset_id"),
+            "shot": ("shots", "shot_id"),
+            "task": ("tasks", "task_id"),
+            "output_file": ("outputFiles", "output_file_id")
+        }
+        changedIds = dict([(kind, set()) for kind in ["assets", "shots", "tasks", "outputFiles", "casting"]])
+        removedIds = dict([(kind, set()) for kind in ["assets", "shots", "tasks", "outputFiles"]])
+
+        for event in events:
+            eventDatas = event["data"] if event["data"] != None else {}
+            eventName, eventAction = (event["name"].split(":") + [""])[:2]
+
+            if(event["name"] == "shot:casting-update" and "shot_id" in eventDatas):
+                changedIds["casting"].add(eventDatas["shot_id"])
+            elif(eventName in eventKinds and eventKinds[eventName][1] in eventDatas):
+                kind, key = eventKinds[eventName]
+                if(eventAction == "delete"):
+                    removedIds[kind].add(eventDatas[key])
+                else:
+                    changedIds[kind].add(eventDatas[key])
+        
+        for kind in removedIds:
+            changedIds[kind] -= removedIds[kind]
+
+        # Download changed datas, skip the ones already up to date in the snapshot.
+        entities = self.fetchAllByIds("entities", "id", list(changedIds["assets"] | changedIds["shots"]), useCache=False)
+        changedDatas = {
+            "assets": [entity for entity in entities if entity["id"] in changedIds["assets"]],
+            "shots": [entity for entity in entities if entity["id"] in changedIds["shots"]],
+            "tasks": self.fetchAllByIds("tasks", "id", list(changedIds["tasks"]), useCache=False),
+            "outputFiles": self.fetchAllByIds("output-files", "id", list(changedIds["outputFiles"]), useCache=False)
+        }
+
+        for kind in changedDatas:
+            updateDates = snapshot.getUpdateDates(kind, [data["id"] for data in changedDatas[kind]])
+            changedDatas[kind] = [data for data in changedDatas[kind] if updateDates.get(data["id"], None) != data["updated_at"]]
+
+        workingFilesIds = list(set([output["source_file_id"] for output in changedDatas["outputFiles"] if output["source_file_id"] != None]))
+        workingFiles = self.fetchAllByIds("working-files", "id", workingFilesIds, useCache=False)
+
+        casting = []
+        for shotId in changedIds["casting"]:
+            casting.append({"id": shotId, "assets": gazu.casting.get_shot_casting({"id": shotId, "project_id": project.id})})
+
+        # Find all entities using changed or removed datas.
+        affectedIds = set([data["id"] for data in changedDatas["assets"] + changedDatas["shots"]])
+        affectedIds |= removedIds["assets"] | removedIds["shots"] | changedIds["casting"]
+        affectedIds |= set([data["entity_id"] for data in changedDatas["tasks"] + changedDatas["outputFiles"]])
+        affectedIds |= set([data["entity_id"] for data in snapshot.getDatas("tasks", ids=removedIds["tasks"])])
+        affectedIds |= set([data["entity_id"] for data in snapshot.getDatas("outputFiles", ids=removedIds["outputFiles"])])
+
+        # Cached requests of the affected entities are outdated.
+        self.__requestCache.invalidate(ids=affectedIds)
+
+        # Update the snapshot.
+        snapshot.setDatas("assets", changedDatas["assets"])
+        snapshot.setDatas("shots", changedDatas["shots"])
+        snapshot.setDatas("tasks", changedDatas["tasks"], entityKey="entity_id")
+        snapshot.setDatas("outputFiles", changedDatas["outputFiles"], entityKey="entity_id")
+        snapshot.setDatas("workingFiles", workingFiles, entityKey=None)
+        snapshot.setDatas("casting", casting)
+        for kind in removedIds:
+            snapshot.removeDatas(kind, removedIds[kind])
+        snapshot.setInfo("lastEvent", max([event["created_at"] for event in events]))
+
+        # Rebuild affected entities in the project.
+        for category in project.loadedCategories:
+            for entity in [entity for entity in category.entities if entity.id in affectedIds]:
+                category.removeEntity(entity)
+        
+        # Categories not loaded yet will read the updated snapshot.
+        self.clearSnapshotIndex(snapshot)
+
+        self.addBulkEntitiesToProject(project, self.filterLoadedEntities(project, self.readSnapshot(snapshot, entityIds=affectedIds)))
+
+        self.__manager.logging.info("%s : %i entities updated from %i events." % (project.name, len(affectedIds), len(events)))
+
+        return True
+    
+    def filterLoadedEntities(self, project, datas):
+        """Remove the assets and shots of categories not loaded yet from bulk datas.
+
+        Args:
+            project (class: "Project"): Project.
+            datas (dict): Bulk datas.
+
+        Returns:
+            dict: Bulk datas of the loaded categories.
+        """
+        loadedIds = set([category.id for category in project.loadedCategories])
+
+        datas = dict(datas)
+        datas["assets"] = [asset for asset in datas["assets"] if asset["entity_type_id"] in loadedIds]
+        datas["shots"] = [shot for shot in datas["shots"] if shot["parent_id"] in loadedIds]
+
+        return datas
+
+    def loadCategory(self, project, category, snapshot=None):
+        """Get, create and add entities of a single category (used as category loader in lazy mode).
+
+        Args:
+            project (class: "Project"): Project of the category.
+            category (class: "Category"): Category to load.
+            snapshot (class: "ProjectSnapshot", optional): Snapshot read if complete, else built with the category datas. Defaults to None.
+
+        Returns:
+            bool: Loading status, a failed category is loaded again on next access.
+        """
+        self.__manager.logging.info("Getting datas for: %s" % category.name)
+
+        try:
+            for event in self.streamCategory(project, category, snapshot=snapshot):
+                pass
+        except Exception as error:
+            self.__manager.logging.error("%s : Failed to load category (%s)." % (category.name, error))
+            project.addLoadingError(category.id, error)
+            return False
+
+        project.loadingErrors.pop(category.id, None)
+        return True
+    
+    def streamCategory(self, project, category, snapshot=None):
+        """Get, create and add entities of a single category.
+
+        Args:
+            project (class: "Project"): Project of the category.
+            category (class: "Category"): Category to load.
+            snapshot (class: "ProjectSnapshot", optional): Snapshot read if complete, else built with the category datas. Defaults to None.
+
+        Yields:
+            class: "HydrationEvent": Entity added and versions attached events.
+        """
+        if(snapshot != None and snapshot.isValid):
+            entityIds = self.getSnapshotCategoryEntities(snapshot, category)
+            events = self.streamBulkEntities(project, self.readSnapshot(snapshot, entityIds=entityIds))
+        elif(category.type == "Assets"):
+            assets = self.fetch("assets", gazu.asset.all_assets_for_project_and_type, project.rawDatas, category.rawDatas)
+
+            if(self._bulkLoading):
+                datas = self.getBulkDatasForEntities(assets=assets)
+                if(snapshot != None):
+                    self.writeCategorySnapshot(project, snapshot, category, datas)
+                events = self.streamBulkEntities(project, datas)
+            else:
+                events = self.streamHydratedEntities(project, assets, self.hydrateAsset)
+        else:
+            shots = self.fetch("shots", gazu.shot.all_shots_for_sequence, category.rawDatas)
+
+            if(self._bulkLoading):
+                datas = self.getBulkDatasForEntities(shots=shots, sequences=[category.rawDatas])
+                if(snapshot != None):
+                    self.writeCategorySnapshot(project, snapshot, category, datas)
+                events = self.streamBulkEntities(project, datas)
+            else:
+                events = self.streamHydratedEntities(project, shots, self.hydrateShot)
+
+        for event in events:
+            yield event
+    
+    def streamHydratedEntities(self, project, entities, hydrateFunction):
+        """Hydrate entities in parallel and add them to their categories.
+
+        Entities are hydrated by chunks, only one chunk of results is kept in memory
+        and the events of a chunk are yielded before the next one is downloaded.
+
+        Args:
+            project (class: "Project"): Project with tasks and categories already loaded.
+            entities (list): Entities datas from a listing.
+            hydrateFunction (function): Function returning the entity and its category name.
+
+        Yields:
+            class: "HydrationEvent": Entity added and versions attached events.
+        """
+        chunkSize = self.__workerPool.maxWorkers * 4
+
+        for chunkStart in range(0, len(entities), chunkSize):
+            chunk = entities[chunkStart:chunkStart + chunkSize]
+            results = self.__workerPool.map(lambda entity: hydrateFunction(project, entity), chunk)
+
+            for index, (entity, (result, error)) in enumerate(zip(chunk, results)):
+                self.reportEntitiesLoading(chunkStart + index + 1, len(entities))
 
+                if(error != None):
+                    self.__manager.logging.error("%s : Failed to load (%s)." % (entity["name"], error))
+                    project.addLoadingError(entity["id"], error)
+                    continue
+
+                newEntity, categoryName = result
+                category = project.getCategoryByName(categoryName)
+                if(category == None):
+                    self.__manager.logging.warning("%s : No category found, entity skipped." % entity["name"])
+                    continue
+
+                category.addEntity(newEntity)
+                yield HydrationEvent(HydrationEvent.entityAdded, newEntity, category)
+                yield HydrationEvent(HydrationEvent.versionsAttached, newEntity.versions, newEntity)
+    
+    def hydrateAsset(self, project, asset):
+        """Get all datas for an asset and build it.
+
+        Args:
+            project (class: "Project"): Project with tasks loaded.
+            asset (dict): Asset datas from a listing.
+
+        Returns:
+            tuple: (class: "Entity", str): Asset and its category name.
+        """
+        # Get all datas for asset.
+        assetData = self.fetch("assets", gazu.asset.get_asset, asset["id"])
+        
+        if(self.__manager.debug and self.__debugKitsuData):
+            self.__manager.logging.debug(json.dumps(assetData, sort_keys=True, indent=4))
+        
+        # Get tasks for asset.
+        assetTasks = []
+        for assetTask in self.fetch("tasks", gazu.task.all_task_types_for_asset, assetData):
+            task = project.getTask(assetTask["id"])
+            if(task != None):
+                assetTasks.append(task)
+        
+        # Output versionning.
+        versions = self.getVersions(project, assetData)
+
+        # Buildint the Entity with all datas.
+        newAsset = Entity(manager=self.__manager,
+                            entityType="Assets",
+                            id=asset["id"],
+                            name=asset["name"],
+                            description=asset["description"],
+                            icon="",
+                            tasks=assetTasks,
+                            versions=versions,
+                            rawDatas=asset)
+        
+        return newAsset, assetData["asset_type_name"]
+    
+    def hydrateShot(self, project, shot):
+        """Get all datas for a shot and build it.
+
+        Args:
+            project (class: "Project"): Project with tasks loaded.
+            shot (dict): Shot datas from a listing.
+
+        Returns:
+            tuple: (class: "Entity", str): Shot and its sequence name.
+        """
+        shotData = self.fetch("shots", gazu.shot.get_shot, shot["id"])
+
+        if(self.__manager.debug and self.__debugKitsuData):
+            self.__manager.logging.debug(json.dumps(shotData, sort_keys=True, indent=4))
+
+        # Get technical datas.
+        nb_frames = self.getFrameNumber(shotData)
+        
+        # Get Assets assigned in the shot.
+        assignedAssets = [str(asset["id"]) for asset in self.fetch("casting", gazu.asset.all_assets_for_shot, shotData)]
+
+        # Get tasks for shot.
+        shotTasks = []
+        for shotTask in self.fetch("tasks", gazu.task.all_task_types_for_shot, shotData):
+            task = project.getTask(shotTask["id"])
+            if(task != None):
+                shotTasks.append(task)
+
+        # Output versionning.
+        versions = self.getVersions(project, shotData)
+
+        newShot = Entity(manager=self.__manager,
+                            entityType="Shots",
+                            id=shot["id"],
+                            name=shot["name"],
+                            description=shot["description"],
+                            icon="",
+                            tasks=shotTasks,
+                            versions=versions,
+                            frameNumber=nb_frames,
+                            assignedAssets=assignedAssets,
+                            rawDatas=shot)
+
+        return newShot, shotData["sequence_name"]
+    
+    def streamSequences(self, project, sequences):
+        """Create and add sequences categories to the project.
+
+        Args:
+            project (class: "Project"): Project to fill.
+            sequences (list): Sequences datas.
+
+        Yields:
+            class: "HydrationEvent": Category added events.
+        """
         for sequence in sequences:
             newCategory = Category(id=sequence["id"],
                                     name=sequence["name"],
@@ -207,65 +938,274 @@ class KitsuWrapper(DefaultWrapper):
                                     type="Shots",
                                     rawDatas=sequence)
             
-            newProject.addCategory(newCategory)
+            project.addCategory(newCategory)
+            yield HydrationEvent(HydrationEvent.categoryAdded, newCategory, project)
+    
+    def getFrameNumber(self, shotData):
+        """Get the duration of a shot in frames.
+
+        Args:
+            shotData (dict): Shot datas, frame range can be stored in the "data" field.
+
+        Returns:
+            int: Frame number.
+        """
+        nb_frames = 0
+
+        if(shotData["nb_frames"] != None):
+            nb_frames = shotData["nb_frames"]
+
+            extraDatas = shotData["data"] if "data" in shotData and shotData["data"] != None else {}
+            frameIn = shotData["frame_in"] if "frame_in" in shotData else extraDatas.get("frame_in", None)
+            frameOut = shotData["frame_out"] if "frame_out" in shotData else extraDatas.get("frame_out", None)
+
+            if(nb_frames == 0 and frameIn != None and frameOut != None):
+                nb_frames = int(frameOut) - int(frameIn)
         
-        self.__manager.logging.info("Sequences loaded.")
+        return nb_frames
+    
+    def getBulkDatasFromProject(self, project, sequences):
+        """Get all the entities datas of a project with project-wide queries.
 
-        # Get, create and add shots to sequences.
-        shots = gazu.shot.all_shots_for_project(project)
+        The number of requests only depends on the number of sequences
+        and on the chunk size of the id filters, not on the number of entities.
 
-        for shot in shots:
-            shotData = gazu.shot.get_shot(shot["id"])
+        Args:
+            project (dict): Project datas.
+            sequences (list): Sequences datas.
 
-            if(self.__manager.debug and self.__debugKitsuData):
-                self.__manager.logging.debug(json.dumps(shotData, sort_keys=True, indent=4))
+        Returns:
+            dict: Raw lists ("assets", "shots", "tasks", "outputFiles", "workingFiles", "casting").
+        """
+        assets = self.fetch("assets", gazu.asset.all_assets_for_project, project)
+        shots = self.fetch("shots", gazu.shot.all_shots_for_project, project)
+        tasks = self.fetch("tasks", gazu.client.fetch_all, "tasks", {"project_id": project["id"]})
 
-            # Get technical datas.
-            nb_frames = 0
+        return self.getBulkDatasForEntities(assets=assets, shots=shots, sequences=sequences, tasks=tasks)
+    
+    def getBulkDatasForEntities(self, assets=[], shots=[], sequences=[], tasks=None):
+        """Get tasks, output files and casting of a list of entities with grouped queries.
 
-            if(shotData["nb_frames"] != None):
-                nb_frames = shotData["nb_frames"]
+        Args:
+            assets (list, optional): Assets datas. Defaults to [].
+            shots (list, optional): Shots datas. Defaults to [].
+            sequences (list, optional): Sequences of the shots. Defaults to [].
+            tasks (list, optional): Tasks datas, fetched from entities if None. Defaults to None.
 
-                if(nb_frames == 0 and 
-                    shotData["frame_in"] != None and shotData["frame_out"] != None):
-                    nb_frames = int(shotData["frame_out"]) - int(shotData["frame_in"])
-            
-            # Get Assets assigned in the shot.
-            assignedAssets = [str(asset["id"]) for asset in gazu.asset.all_assets_for_shot(shotData)]
+        Returns:
+            dict: Raw lists ("assets", "shots", "tasks", "outputFiles", "workingFiles", "casting").
+        """
+        entitiesIds = [entity["id"] for entity in assets + shots]
 
-            
-            # Get tasks for shot.
-            shotTasks = []
-            for shotTask in gazu.task.all_task_types_for_shot(shotData):
-                shotTasks.append([task for task in newProject.tasks if task.id == shotTask["id"]][0])
-
-            # Output versionning.
-            versions = self.getVersions(newProject, shotData)
-
-            newShot = Entity(manager=self.__manager,
-                                entityType="Shots",
-                                id=shot["id"],
-                                name=shot["name"],
-                                description=shot["description"],
-                                icon="",
-                                tasks=shotTasks,
-                                versions=versions,
-                                frameNumber=nb_frames,
-                                assignedAssets=assignedAssets,
-                                rawDatas=shot)
-
-            shotSequence = [sequence for sequence in newProject.categories if sequence.name == shotData["sequence_name"]][0]
-            shotSequence.addEntity(newShot)
+        if(tasks == None):
+            tasks = self.fetchAllByIds("tasks", "entity_id", entitiesIds)
 
-        self.__manager.logging.info("Shots loaded.")
+        outputFiles = self.fetchAllByIds("output-files", "entity_id", entitiesIds)
 
-        return newProject
+        workingFilesIds = list(set([output["source_file_id"] for output in outputFiles if output["source_file_id"] != None]))
+        workingFiles = self.fetchAllByIds("working-files", "id", workingFilesIds)
+
+        casting = {}
+        for sequence in sequences:
+            casting.update(self.fetch("casting", gazu.casting.get_sequence_casting, sequence))
+
+        self.__manager.logging.debug("Bulk datas: %i assets, %i shots, %i tasks, %i output files." % (len(assets), len(shots), len(tasks), len(outputFiles)))
+
+        return {
+            "assets": assets,
+            "shots": shots,
+            "tasks": tasks,
+            "outputFiles": outputFiles,
+            "workingFiles": workingFiles,
+            "casting": casting
+        }
     
-    def downloadPreview(self, entityType="Assets", entityId=None):
+    def fetchAllByIds(self, path, key, ids, useCache=True):
+        """Fetch a Zou collection filtered by a list of ids.
+
+        Ids are sent by chunks to keep the query string short.
+
+        Args:
+            path (str): Collection path (example: "output-files"), also used as cache endpoint.
+            key (str): Field to filter on.
+            ids (list): Accepted values for the field.
+            useCache (bool, optional): Use the request cache, disable it to get the latest datas. Defaults to True.
+
+        Returns:
+            list: Results.
+        """
+        results = []
+        for i in range(0, len(ids), self.__bulkChunkSize):
+            filters = {key: json.dumps(ids[i:i + self.__bulkChunkSize])}
+            if(useCache):
+                results += self.fetch(path, gazu.client.fetch_all, path, filters)
+            else:
+                results += gazu.client.fetch_all(path, filters)
+
+        return results
+    
+    @property
+    def requestCache(self):
+        """Get the cache of read requests.
+
+        Returns:
+            class: "RequestCache": Request cache.
+        """
+        return self.__requestCache
+    
+    @property
+    def httpAdapter(self):
+        """Get the HTTP adapter of the Kitsu session.
+
+        Returns:
+            class: "KitsuAdapter": HTTP adapter.
+        """
+        return self.__httpAdapter
+
+    def mountHttpAdapter(self):
+        """Mount the HTTP adapter on the session used by Gazu.
+
+        Every Gazu request (fetches, previews downloads and publish uploads) then uses its connections pool.
+        """
+        # Recent Gazu versions store the session in the default client.
+        if(hasattr(gazu.client, "default_client")):
+            session = getattr(gazu.client.default_client, "session", None)
+        else:
+            session = getattr(gazu.client, "requests_session", None)
+
+        if(session == None):
+            self.__manager.logging.warning("Gazu session not found, requests are not throttled.")
+            return
+
+        session.mount("http://", self.__httpAdapter)
+        session.mount("https://", self.__httpAdapter)
+
+    def fetch(self, endpoint, function, *args, **kwargs):
+        """Do a read request through the request cache, concurrent identical requests are done once.
+
+        Args:
+            endpoint (str): Endpoint name (example: "assets"), used for time to live and invalidation.
+            function (function): Gazu function doing the request.
+
+        Returns:
+            object: Request result.
+        """
+        return self.__requestCache.call(endpoint, function, *args, **kwargs)
+    
+    def invalidateEntity(self, entityId):
+        """Remove the cached requests of an entity, called after an online change.
+
+        Args:
+            entityId (str): Entity ID.
+        """
+        count = self.__requestCache.invalidate(ids=[entityId])
+        self.__manager.logging.debug("%s : %i cached requests removed." % (entityId, count))
+    
+    def addBulkEntitiesToProject(self, project, datas):
+        """Build assets and shots from bulk datas and add them to the project.
+
+        Args:
+            project (class: "Project"): Project with tasks and categories already loaded.
+            datas (dict): Datas from "getBulkDatasFromProject".
+        """
+        for event in self.streamBulkEntities(project, datas):
+            pass
+    
+    def streamBulkEntities(self, project, datas):
+        """Build assets and shots from bulk datas and add them to the project.
+
+        Args:
+            project (class: "Project"): Project with tasks and categories already loaded.
+            datas (dict): Datas from "getBulkDatasFromProject".
+
+        Yields:
+            class: "HydrationEvent": Entity added and versions attached events.
+        """
+        # Join tasks types to entities, in the order of the tasks like the hydrated entities.
+        entitiesTaskTypes = {}
+        for task in datas["tasks"]:
+            taskTypes = entitiesTaskTypes.setdefault(task["entity_id"], [])
+            if(task["task_type_id"] not in taskTypes):
+                taskTypes.append(task["task_type_id"])
+
+        # Join output files (with their working file) to entities.
+        workingFiles = dict([(workingFile["id"], workingFile) for workingFile in datas["workingFiles"]])
+        entitiesOutputs = {}
+        for output in datas["outputFiles"]:
+            output["source_file"] = workingFiles.get(output["source_file_id"], {"path": ""})
+            entitiesOutputs.setdefault(output["entity_id"], []).append(output)
+
+        count = 0
+        total = len(datas["assets"]) + len(datas["shots"])
+        for entityType, entities in (("Assets", datas["assets"]), ("Shots", datas["shots"])):
+            for entity in entities:
+                count += 1
+                self.reportEntitiesLoading(count, total)
+
+                entityTasks = []
+                for taskType in entitiesTaskTypes.get(entity["id"], []):
+                    task = project.getTask(taskType)
+                    if(task != None):
+                        entityTasks.append(task)
+
+                outputs = sorted(entitiesOutputs.get(entity["id"], []), key=lambda output: output["revision"], reverse=True)
+                versions = self.buildVersions(project, outputs)
+
+                if(entityType == "Assets"):
+                    newEntity = Entity(manager=self.__manager,
+                                        entityType="Assets",
+                                        id=entity["id"],
+                                        name=entity["name"],
+                                        description=entity["description"],
+                                        icon="",
+                                        tasks=entityTasks,
+                                        versions=versions,
+                                        rawDatas=entity)
+
+                    category = project.getCategory(entity["entity_type_id"])
+                else:
+                    assignedAssets = [str(casting["asset_id"]) for casting in datas["casting"].get(entity["id"], [])]
+
+                    newEntity = Entity(manager=self.__manager,
+                                        entityType="Shots",
+                                        id=entity["id"],
+                                        name=entity["name"],
+                                        description=entity["description"],
+                                        icon="",
+                                        tasks=entityTasks,
+                                        versions=versions,
+                                        frameNumber=self.getFrameNumber(entity),
+                                        assignedAssets=assignedAssets,
+                                        rawDatas=entity)
+
+                    category = project.getCategory(entity["parent_id"])
+                
+                if(category == None):
+                    self.__manager.logging.warning("%s : No category found, entity skipped." % entity["name"])
+                    continue
+
+                category.addEntity(newEntity)
+                yield HydrationEvent(HydrationEvent.entityAdded, newEntity, category)
+                yield HydrationEvent(HydrationEvent.versionsAttached, newEntity.versions, newEntity)
+    
+    def reportEntitiesLoading(self, count, total):
+        """Send the entities loading progress to the manager, only every 100 entities.
+
+        Args:
+            count (int): Number of entities loaded.
+            total (int): Number of entities to load.
+        """
+        if(count % 100 == 0 or count == total):
+            self.__manager.reportLoading("entities", count, total)
+    
+    def downloadPreview(self, entityType="Assets", entityId=None, entityData=None, size=None):
         """Download the preview from Kitsu.
 
         Args:
-            entityData (class:"gazu.entity"): Entity datas. Defaults to None.
+            entityType (str, optional): Entity type, "Assets" or "Shots". Defaults to "Assets".
+            entityId (str, optional): Entity ID. Defaults to None.
+            entityData (dict, optional): Entity datas already loaded, avoid a request. Defaults to None.
+            size (int, optional): Displayed size, get the nearest downsampled preview. Defaults to None.
 
         Returns:
             str: Path of the icon.
@@ -273,49 +1213,261 @@ class KitsuWrapper(DefaultWrapper):
         if(int(self.__manager.preferences.getValue("MANAGER", "loadPreviews")) == 0):
             return ""
         
-        if(entityType == "Assets"):
-            entityData = gazu.asset.get_asset(entityId)
-        elif(entityType == "Shots"):
-            # Shots not supported for now.
-            entityData = gazu.shot.get_shot(entityId)
-            return ""
-        else:
+        if(not isinstance(entityData, dict) or "preview_file_id" not in entityData):
+            if(entityType == "Assets"):
+                entityData = self.fetch("assets", gazu.asset.get_asset, entityId)
+            elif(entityType == "Shots"):
+                entityData = self.fetch("shots", gazu.shot.get_shot, entityId)
+            else:
+                return ""
+
+        if(entityData["preview_file_id"] == None):
             return ""
-        
+
+        # Downsampled previews are built once from the full size one.
+        if(size != None):
+            level = thumbnailPyramid.getLevel(size)
+            icon_path = self.__thumbnailCache.get(thumbnailPyramid.getLevelKey(entityData["preview_file_id"], level))
+            if(icon_path != None):
+                return icon_path
+
+            icon_path = self.downloadPreview(entityType=entityType, entityId=entityId, entityData=entityData)
+            if(icon_path == ""):
+                return icon_path
+
+            return thumbnailPyramid.buildPyramid(self.__thumbnailCache, entityData["preview_file_id"], icon_path).get(level, icon_path)
+
+        # Previews are cached between sessions from their ID.
+        icon_path = self.__thumbnailCache.get(entityData["preview_file_id"])
+        if(icon_path != None):
+            return icon_path
+
         # Getting the preview picture.
         icon_path = ""
-        tempPath = self.__manager.tempFolder
 
-        try:
-            preview_file = gazu.files.get_preview_file(entityData["preview_file_id"])
-        except gazu.exception.NotAllowedException:
+        preview_file = self.getPreviewFile(entityId, entityData["preview_file_id"], projectId=entityData.get("project_id", None))
+        if(preview_file == None):
             self.__manager.logging.debug("%s : Acces refused to preview." % entityData["name"])
+        elif(preview_file["is_movie"]):
+            self.__manager.logging.debug("%s : Preview file is a movie, can't be loaded in Hestia." % entityData["name"])
+            icon_path = self.__thumbnailCache.put(preview_file["id"], "png",
+                                                    lambda path: gazu.files.download_preview_file_thumbnail(preview_file, path))
         else:
-            if(preview_file["is_movie"]):
-                self.__manager.logging.debug("%s : Preview file is a movie, can't be loaded in Hestia." % entityData["name"])
-                icon_path = tempPath + os.path.sep + preview_file["id"] + ".png"
-                gazu.files.download_preview_file_thumbnail(preview_file, icon_path)
-            else:
-                self.__manager.logging.debug("%s : Loading preview." % entityData["name"])
-                icon_path = tempPath + os.path.sep + preview_file["id"] + "." + preview_file["extension"]
-                gazu.files.download_preview_file(preview_file, icon_path)
+            self.__manager.logging.debug("%s : Loading preview." % entityData["name"])
+            icon_path = self.__thumbnailCache.put(preview_file["id"], preview_file["extension"],
+                                                    lambda path: gazu.files.download_preview_file(preview_file, path))
         
         return icon_path
     
+    def getCategoryAtlas(self, category, size):
+        """Get the previews atlas of a category.
+
+        Args:
+            category (class: "Category"): Category.
+            size (int): Displayed size of previews.
+
+        Returns:
+            tuple: (str, dict): Path of the atlas image and rectangles by entity ID, (None, {}) if not available.
+        """
+        if(not bool(int(self.__manager.preferences.getValue("MANAGER", "thumbnailsAtlas")))):
+            return None, {}
+
+        # Called from the UI thread, the cache folder is read in background.
+        if(not self.__thumbnailCache.scanned):
+            return None, {}
+
+        level = thumbnailPyramid.getLevel(size)
+        atlasPath, index = thumbnailAtlas.loadAtlas(self.__thumbnailCache, "%s_%i" % (category.id, level))
+        if(atlasPath == None):
+            return None, {}
+
+        # Only use previews that didn't change since the atlas was built.
+        rects = {}
+        for entity in category.entities:
+            if(not isinstance(entity.rawDatas, dict) or entity.id not in index["rects"]):
+                continue
+
+            if(index["datas"].get(entity.id, None) == entity.rawDatas.get("preview_file_id", None)):
+                rects[entity.id] = index["rects"][entity.id]
+
+        return atlasPath, rects
+    
+    def buildCategoryAtlas(self, category, size):
+        """Pack the cached previews of a category in an atlas.
+        Previews not downloaded yet are skipped, the atlas isn't built again if its previews didn't change.
+
+        Args:
+            category (class: "Category"): Category.
+            size (int): Displayed size of previews.
+
+        Returns:
+            bool: Atlas status.
+        """
+        if(not bool(int(self.__manager.preferences.getValue("MANAGER", "thumbnailsAtlas")))):
+            return False
+
+        level = thumbnailPyramid.getLevel(size)
+        images = []
+        previews = {}
+        for entity in category.entities:
+            if(not isinstance(entity.rawDatas, dict) or entity.rawDatas.get("preview_file_id", None) == None):
+                continue
+
+            path = self.__thumbnailCache.get(thumbnailPyramid.getLevelKey(entity.rawDatas["preview_file_id"], level))
+            if(path != None):
+                images.append((entity.id, path))
+                previews[entity.id] = entity.rawDatas["preview_file_id"]
+
+        atlasPath, index = thumbnailAtlas.loadAtlas(self.__thumbnailCache, "%s_%i" % (category.id, level))
+        if(atlasPath != None and index["datas"] == previews):
+            # Atlas up to date.
+            return True
+
+        index = thumbnailAtlas.buildAtlas(self.__thumbnailCache, "%s_%i" % (category.id, level), images, level, datas=previews)
+        if(index == None):
+            return False
+
+        self.__manager.logging.debug("%s : Previews atlas built with %i previews." % (category.name, len(index["rects"])))
+        return True
+    
+    def getPreviewFile(self, entityId, previewFileId, projectId=None):
+        """Get the datas of a preview file.
+        Preview files of the entity category are downloaded at once on first call.
+
+        Args:
+            entityId (str): ID of the entity using the preview.
+            previewFileId (str): Preview file ID.
+            projectId (str, optional): ID of the entity project, all projects are searched if None. Defaults to None.
+
+        Returns:
+            dict: Preview file datas, None if not allowed.
+        """
+        with self.__previewFilesLock:
+            preview_file = self.__previewFiles.get(previewFileId, None)
+
+        if(preview_file == None):
+            self.resolveCategoryPreviews(entityId, projectId=projectId)
+
+            with self.__previewFilesLock:
+                preview_file = self.__previewFiles.get(previewFileId, None)
+
+        if(preview_file != None):
+            return preview_file
+
+        try:
+            preview_file = self.fetch("preview-files", gazu.files.get_preview_file, previewFileId)
+        except gazu.exception.NotAllowedException:
+            return None
+
+        with self.__previewFilesLock:
+            self.__previewFiles[previewFileId] = preview_file
+
+        return preview_file
+    
+    def getEntityCategory(self, entityId, projectId=None):
+        """Find the category of an entity in the loaded projects.
+
+        Args:
+            entityId (str): Entity ID.
+            projectId (str, optional): ID of the entity project, all projects are searched if None. Defaults to None.
+
+        Returns:
+            class: "Category": Category, None if not found.
+        """
+        for project in list(self.__manager.projects):
+            if(projectId != None and project.id != projectId):
+                continue
+
+            category = project.getEntityCategory(entityId)
+            if(category != None):
+                return category
+
+        return None
+    
+    def resolveCategoryPreviews(self, entityId, projectId=None):
+        """Download the datas of every preview file used in the category of an entity.
+        Requests for a category already downloading wait for it instead of sending their own request.
+
+        Args:
+            entityId (str): Entity ID.
+            projectId (str, optional): ID of the entity project, all projects are searched if None. Defaults to None.
+        """
+        category = self.getEntityCategory(entityId, projectId=projectId)
+        if(category == None):
+            return
+
+        with self.__previewFilesLock:
+            resolved = self.__previewsCategories.get(category.id, None)
+            if(resolved == None):
+                # Category marked in progress, datas are downloaded outside of the lock.
+                resolved = threading.Event()
+                self.__previewsCategories[category.id] = resolved
+                leader = True
+            else:
+                leader = False
+
+        if(not leader):
+            resolved.wait()
+            return
+
+        try:
+            previewFileIds = []
+            for entity in category.entities:
+                if(not isinstance(entity.rawDatas, dict) or entity.rawDatas.get("preview_file_id", None) == None):
+                    continue
+
+                previewFileId = entity.rawDatas["preview_file_id"]
+                # Cached previews don't need their datas.
+                with self.__previewFilesLock:
+                    known = previewFileId in self.__previewFiles
+                if(not known and self.__thumbnailCache.get(previewFileId) == None):
+                    previewFileIds.append(previewFileId)
+
+            if(len(previewFileIds) == 0):
+                return
+
+            try:
+                previewFiles = self.fetchAllByIds("preview-files", "id", previewFileIds)
+            except Exception as error:
+                self.__manager.logging.debug("%s : Previews datas can't be downloaded (%s)." % (category.name, error))
+                return
+
+            with self.__previewFilesLock:
+                for preview_file in previewFiles:
+                    self.__previewFiles[preview_file["id"]] = preview_file
+
+            self.__manager.logging.debug("%s : %i previews datas loaded." % (category.name, len(previewFiles)))
+        finally:
+            resolved.set()
+    
     def getVersions(self, project=None, entityData=None):
         """Get versions for entity.
 
         Args:
             entityData (class:"gazu.entity", optional): Entity datas. Defaults to None.
 
+        Returns:
+            list:"Version": List of versions.
+        """
+        return self.buildVersions(project, self.fetch("output-files", gazu.files.all_output_files_for_entity, entityData))
+    
+    def buildVersions(self, project=None, outputs=[]):
+        """Build versions from output files datas.
+
+        Args:
+            project (class: "Project"): Project of the entity.
+            outputs (list): Output files datas.
+
         Returns:
             list:"Version": List of versions.
         """
         versions = []
-        outputs = gazu.files.all_output_files_for_entity(entityData)
 
         for output in outputs:
-            task = [task for task in project.tasks if task.id == output["task_type_id"]][0]
+            task = project.getTask(output["task_type_id"])
+            if(task == None):
+                self.__manager.logging.warning("%s : Unknown task type, version skipped." % output["id"])
+                continue
 
             newVersion = Version(id=output["id"],
                                     name="",
@@ -330,6 +1482,32 @@ class KitsuWrapper(DefaultWrapper):
 
         return versions
     
+    def refreshEntity(self, project, entity):
+        """Download the latest output files and tasks of a single entity and update it.
+
+        Args:
+            project (class: "Project"): Project of the entity.
+            entity (class: "Entity"): Entity to update.
+
+        Returns:
+            bool: Refresh status.
+        """
+        self.__manager.logging.info("Refreshing %s." % entity.name)
+
+        # Cached datas of the entity are outdated.
+        self.invalidateEntity(entity.id)
+
+        if(entity.type == "Assets"):
+            entityTasks = self.fetch("tasks", gazu.task.all_tasks_for_asset, entity.rawDatas)
+        else:
+            entityTasks = self.fetch("tasks", gazu.task.all_tasks_for_shot, entity.rawDatas)
+
+        taskTypes = set([task["task_type_id"] for task in entityTasks])
+        entity.tasks = [task for task in project.tasks if task.id in taskTypes]
+        entity.versions = self.getVersions(project, entity.rawDatas)
+
+        return True
+    
     def publish(self, entity=None, name="", comment="", taskTypeID="", taskStatus="TODO", version="", software="", outputType="", workingFilePath="", outputFiles=[], previewFilePath=""):
         """Publish files (working and outputs) to Kitsu. (Code from Guillaume Baratte project's called managerTools)
 
@@ -363,7 +1541,7 @@ class KitsuWrapper(DefaultWrapper):
 
         # Assigning softwate.
         if(software != ""):
-            softwareData = gazu.client.fetch_first(
+            softwareData = self.fetch("softwares", gazu.client.fetch_first,
                             "softwares",
                             {
                                 "name": name
@@ -401,7 +1579,7 @@ class KitsuWrapper(DefaultWrapper):
             else:
                 outputTypeName = outputType
 
-            outputTypeData = gazu.client.fetch_first(
+            outputTypeData = self.fetch("output-types", gazu.client.fetch_first,
                                     "output-types",
                                     {
                                         "name": outputTypeName
@@ -435,7 +1613,7 @@ class KitsuWrapper(DefaultWrapper):
             outputFilesPublishData.append(outputFilePublishData)
         
         # Add the comment.
-        taskStatusData = gazu.task.get_task_status_by_short_name(taskStatus.lower())
+        taskStatusData = self.fetch("task-status", gazu.task.get_task_status_by_short_name, taskStatus.lower())
         
         if(taskStatusData != None):
             commentData = {
@@ -461,4 +1639,7 @@ class KitsuWrapper(DefaultWrapper):
         else:
             self.__manager.logging.error("Couldn't find the status for publishing, comment and preview wouldn't be published.")
 
+        # Cached datas of the entity don't include the publish.
+        self.invalidateEntity(entity.id)
+
         return True
\ No newline at end of file
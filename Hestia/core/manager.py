@@ -7,6 +7,7 @@
 """
 import shutil, logging
 import tempfile, atexit
+import threading
 
 from .preferences                           import Preferences
 
@@ -15,6 +16,8 @@ from .links.dccs.defaultIntegration         import DefaultIntegration
 from .links.projectManagers.defaultWrapper  import DefaultWrapper
 
 from .project                               import Project
+from .workerPool                            import WorkerPool
+from .previewLoader                         import PreviewLoader
 
 class Manager():
     """Manager class.
@@ -66,6 +69,16 @@ class Manager():
 
         self.__projects = projects
         self.__currentProject = 0
+
+        # Maximum number of projects loaded at the same time in background.
+        self.__backgroundProjectsWorkers = 4
+
+        # Previews are downloaded in background.
+        self.__previewLoader = PreviewLoader(manager=self, maxWorkers=int(self.__preferences.getValue("MANAGER", "previewWorkers")))
+
+        # Projects loading progress, called with the step name, the number of items loaded and the total.
+        self.__loadingCallback = None
+        self.__loadingCancelled = threading.Event()
     
     @property
     def logging(self):
@@ -137,11 +150,33 @@ class Manager():
         Args:
             newCurrentProject (int): New current project.
         """
-        if(newCurrentProject is int):
+        if(isinstance(newCurrentProject, int) and newCurrentProject < len(self.__projects)):
             self.__currentProject = newCurrentProject
         else:
             self.__currentProject = 0
+        
+        # Remember the project for the next session.
+        if(len(self.__projects) > 0):
+            self.__preferences.setValue("MANAGER", "lastProject", self.__projects[self.__currentProject].id)
     
+    @property
+    def previewLoader(self):
+        """Get the background previews loader.
+
+        Returns:
+            class: "PreviewLoader": Previews loader.
+        """
+        return self.__previewLoader
+
+    @property
+    def loadingCancelled(self):
+        """Get the cancellation status of the projects loading.
+
+        Returns:
+            bool: Is the loading cancelled.
+        """
+        return self.__loadingCancelled.is_set()
+
     @property
     def link(self):
         """Get the current link.
@@ -193,6 +228,24 @@ class Manager():
 
         self.__logging.debug("Logging system setup successfully.")
     
+    def setProjects(self, projects, currentProject=0, cleanProjects=True):
+        """Add the projects built by "connectToOnline", called from the thread reading the projects (the UI thread).
+
+        A new list is stored, a thread reading the old one is never affected.
+
+        Args:
+            projects (list(class: "Project")): Projects to add.
+            currentProject (int, optional): Index of the current project in projects. Defaults to 0.
+            cleanProjects (bool, optional): Remove the old projects. Defaults to True.
+        """
+        oldProjects = [] if cleanProjects else self.__projects
+        self.__projects = oldProjects + list(projects)
+
+        if(len(projects) > 0):
+            self.__currentProject = len(oldProjects) + currentProject
+        elif(cleanProjects):
+            self.__currentProject = 0
+
     def addProject(self, project):
         """Add a new project to the projects list.
 
@@ -217,13 +270,36 @@ class Manager():
 
         Args:
             service (str, optional): Service name. Defaults to "kitsu".
+            forceResync (bool, optional): Ignore projects snapshots and download everything. Defaults to False.
+            progressCallback (function, optional): Function called with the step name, the number of items loaded and the total. Defaults to None.
+            projectsCallback (function, optional): Function called with the projects and the index of the current one once it is loaded,
+                                                    they are added to the manager if None. Defaults to None.
 
         Returns:
             bool: Connection status.
         """
-        if(cleanProjects):
-            self.__projects = []
+        if(not "projectsCallback" in kwargs or kwargs["projectsCallback"] == None):
+            # Synchronous connection, the calling thread owns the projects.
+            kwargs["projectsCallback"] = lambda projects, currentProject: self.setProjects(projects, currentProject, cleanProjects=cleanProjects)
+
+        self.__loadingCallback = kwargs["progressCallback"] if "progressCallback" in kwargs else None
+        self.__loadingCancelled.clear()
+
+        try:
+            return self.connectToKitsu(**kwargs)
+        finally:
+            # Projects loaded in background don't report their progress.
+            self.__loadingCallback = None
+
+    def connectToKitsu(self, **kwargs):
+        """Login to Kitsu, build the open projects and load the first one.
 
+        Projects are built in a new list sent to the projects callback,
+        the list of the manager is never modified by this function.
+
+        Returns:
+            bool: Connection status.
+        """
         if(self.__mode == "kitsu"
             and kwargs["api"] != ""
             and kwargs["username"] != ""
@@ -234,14 +310,138 @@ class Manager():
             if(isUserLoged):
                 openProjects = self.__link.getOpenProjects()
 
+                # The last used project is loaded first, the other ones are loaded in background.
+                lastProject = self.__preferences.getValue("MANAGER", "lastProject")
+                openProjects = sorted(openProjects, key=lambda project: project["id"] != lastProject)
+
+                forceResync = kwargs["forceResync"] if "forceResync" in kwargs else False
+                projects = []
                 for project in openProjects:
-                    self.addProject(self.__link.getDatasFromProject(project))
+                    if(self.loadingCancelled):
+                        return False
+
+                    newProject = self.__link.buildProject(project)
+                    newProject.loader = lambda project: self.loadOnlineProject(project, forceResync=forceResync)
+                    projects.append(newProject)
+
+                    self.reportLoading("projects", len(projects), len(openProjects))
+                
+                if(len(projects) > 0):
+                    projects[0].load()
+
+                    if(self.loadingCancelled):
+                        return False
+
+                kwargs["projectsCallback"](projects, 0)
+
+                if(len(projects) > 1):
+                    self.loadProjectsInBackground(projects[1:])
                 
                 return True
 
             return False
         return False
     
+    def loadOnlineProject(self, project, forceResync=False):
+        """Load tasks, categories and entities of a project from the online service.
+
+        Args:
+            project (class: "Project"): Project with metadatas only.
+            forceResync (bool, optional): Ignore the project snapshot and download everything. Defaults to False.
+        """
+        self.__link.loadProjectDatas(project, forceResync=forceResync)
+
+        # Apply changes made online since the project snapshot.
+        self.__link.syncProject(project)
+    
+    def loadProjectsInBackground(self, projects):
+        """Load projects in a background thread.
+        A project selected before the end of its loading will wait for it.
+
+        Args:
+            projects (list(class: "Project")): Projects to load.
+        """
+        def loadProject(project):
+            if(self.loadingCancelled):
+                return False
+
+            project.load()
+            return True
+
+        def loadProjects():
+            results = WorkerPool(maxWorkers=self.__backgroundProjectsWorkers).map(loadProject, projects)
+
+            for project, (result, error) in zip(projects, results):
+                if(error != None):
+                    self.__logging.error("%s : Background loading failed (%s)." % (project.name, error))
+                elif(result):
+                    self.__logging.info("%s : Loaded in background." % project.name)
+
+        thread = threading.Thread(target=loadProjects)
+        thread.daemon = True
+        thread.start()
+    
+    def loadCategories(self, project, callback=None):
+        """Load the entities of the categories not loaded yet, the current category first.
+
+        Args:
+            project (class: "Project"): Project.
+            callback (function, optional): Function called with the category, the number of categories loaded and the total after each category. Defaults to None.
+
+        Returns:
+            bool: False if the loading has been cancelled.
+        """
+        currentCategory = project.categories[project.currentCategory] if len(project.categories) > 0 else None
+        categories = sorted([category for category in project.categories if not category.loaded],
+                            key=lambda category: category != currentCategory)
+
+        for index, category in enumerate(categories):
+            if(self.loadingCancelled):
+                return False
+
+            category.load()
+
+            if(callback != None):
+                callback(category, index + 1, len(categories))
+
+        return True
+
+    def reportLoading(self, step, count, total):
+        """Send the progress of the projects loading to the progress callback of "connectToOnline".
+
+        Args:
+            step (str): Step name ("projects", "tasks", "categories" or "entities").
+            count (int): Number of items loaded.
+            total (int): Number of items to load.
+        """
+        callback = self.__loadingCallback
+        if(callback == None):
+            return
+
+        try:
+            callback(step, count, total)
+        except Exception as error:
+            self.__logging.debug("Loading progress callback failed (%s)." % error)
+
+    def cancelLoading(self):
+        """Stop the projects loading, the current request is finished.
+        """
+        self.__loadingCancelled.set()
+
+    def refreshEntity(self, entity):
+        """Update an entity of the current project with the latest online datas.
+
+        Args:
+            entity (class: "Entity"): Entity to update.
+
+        Returns:
+            bool: Refresh status.
+        """
+        if(self.__mode == "local"):
+            return False
+
+        return self.__link.refreshEntity(project=self.__projects[self.__currentProject], entity=entity)
+    
     def cleanTemporaryFolder(self):
         """Force cleaning temporary folder.
         """
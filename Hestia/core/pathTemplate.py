@@ -0,0 +1,92 @@
+"""
+    :package:   Hestia
+    :file:      pathTemplate.py
+    :brief:     Compiled file tree templates.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import re
+
+class PathTemplate():
+    """Path template class, parse a file tree template (example: "<Project>/<AssetType>/<Asset>")
+    once and render it with a single string formatting.
+
+    Args:
+        template (str): Template string.
+        tokens (list, optional): Tokens allowed in the template, None to allow every token. Defaults to None.
+    """
+    tokenPattern = re.compile(r"<(\w+)>")
+
+    def __init__(self, template, tokens=None):
+        self.__template     = template
+        self.__tokens       = []
+        self.__unknownTokens = []
+
+        # Escape literal parts and replace tokens by named fields.
+        formatter = ""
+        lastIndex = 0
+        for match in self.tokenPattern.finditer(template):
+            token = match.group(1)
+            formatter += template[lastIndex:match.start()].replace("%", "%%")
+            lastIndex = match.end()
+
+            if(tokens != None and token not in tokens):
+                # Unknown tokens are kept as they are written.
+                if(token not in self.__unknownTokens):
+                    self.__unknownTokens.append(token)
+                formatter += match.group(0)
+                continue
+
+            if(token not in self.__tokens):
+                self.__tokens.append(token)
+            formatter += "%%(%s)s" % token
+        formatter += template[lastIndex:].replace("%", "%%")
+
+        self.__formatter = formatter
+
+    @property
+    def template(self):
+        """Get the template string.
+
+        Returns:
+            str: Template.
+        """
+        return self.__template
+
+    @property
+    def tokens(self):
+        """Get the tokens used by the template.
+
+        Returns:
+            list: str: Tokens names.
+        """
+        return self.__tokens
+
+    @property
+    def unknownTokens(self):
+        """Get the tokens of the template that aren't allowed.
+
+        Returns:
+            list: str: Tokens names.
+        """
+        return self.__unknownTokens
+
+    @property
+    def isValid(self):
+        """Check if the template only use allowed tokens.
+
+        Returns:
+            bool: Template status.
+        """
+        return len(self.__unknownTokens) == 0
+
+    def render(self, values):
+        """Render the template.
+
+        Args:
+            values (dict): Values by token name, each token of the template need a value.
+
+        Returns:
+            str: Rendered string.
+        """
+        return self.__formatter % values
@@ -88,6 +88,39 @@ class Preferences():
         self.__config.set("MANAGER", "onlineUsername", "")
         self.__config.set("MANAGER", "rememberLogin", 1)
         self.__config.set("MANAGER", "loadPreviews", 1)
+
+        self.addMissingValues()
+    
+    def addMissingValues(self):
+        """Add values introduced after the preference file was generated.
+        """
+        defaultValues = [
+            ("MANAGER", "bulkLoading", 1),
+            ("MANAGER", "fetchWorkers", 8),
+            ("MANAGER", "lazyLoading", 1),
+            ("MANAGER", "useSnapshots", 1),
+            ("MANAGER", "lastProject", ""),
+            ("MANAGER", "previewWorkers", 4),
+            ("MANAGER", "thumbnailsCacheFolder", ""),
+            ("MANAGER", "thumbnailsCacheSize", 200),
+            ("MANAGER", "thumbnailsAtlas", 1),
+            ("MANAGER", "requestsCacheSize", 50),
+            ("MANAGER", "conditionalRequests", 1),
+            ("MANAGER", "requestsRate", 20),
+            ("MANAGER", "requestsBurst", 40),
+            ("MANAGER", "requestsMaxConcurrency", 8),
+            ("MANAGER", "requestsLatencyLimit", 5),
+            ("MANAGER", "requestsRetries", 4),
+            ("MANAGER", "requestsBackoff", 0.5),
+            ("MANAGER", "requestsMaxBackoff", 30),
+            ("MANAGER", "requestsPoolSize", 16),
+            ("MANAGER", "requestsConnectTimeout", 10),
+            ("MANAGER", "requestsReadTimeout", 60),
+        ]
+
+        for section, key, value in defaultValues:
+            if(not self.__config.has_option(section, key)):
+                self.__config.set(section, key, value)
     
     def loadPreferences(self):
         """Load local preferences.
@@ -97,6 +130,7 @@ class Preferences():
             print("Failed to load preferences.")
             return False
         else:
+            self.addMissingValues()
             return True
     
     def savePreferences(self):
@@ -0,0 +1,115 @@
+"""
+    :package:   Hestia
+    :file:      previewLoader.py
+    :brief:     Background loading of entities previews.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import threading, itertools
+
+try:
+    import queue
+except:
+    import Queue as queue
+
+class PreviewLoader():
+    """Preview loader class, download entities previews with background workers.
+
+    Requests with the lowest priority are downloaded first.
+
+    Args:
+        manager (class: "Manager"): The Hestia Manager.
+        maxWorkers (int, optional): Maximum number of previews downloaded at the same time. Defaults to 4.
+    """
+    def __init__(self, manager, maxWorkers=4):
+        self.__manager = manager
+        self.__maxWorkers = max(1, int(maxWorkers))
+
+        self.__queue = queue.PriorityQueue()
+        self.__order = itertools.count()
+        self.__lock = threading.Lock()
+
+        # Pending requests by (entity ID, size): [entity, priority, callbacks].
+        self.__pending = {}
+        self.__workers = []
+
+    @property
+    def pendingCount(self):
+        """Get the number of previews waiting to be downloaded.
+
+        Returns:
+            int: Number of previews.
+        """
+        return len(self.__pending)
+
+    def request(self, entity, callback=None, priority=0, size=None):
+        """Ask for the preview of an entity.
+
+        The callback is called from a worker thread, UI callbacks need to
+        send the result to the main thread (example: with a Qt signal).
+        Requesting the same preview again only raises its priority, a callback is registered once.
+
+        Args:
+            entity (class: "Entity"): Entity.
+            callback (function, optional): Function called with the entity when its preview is available. Defaults to None.
+            priority (int, optional): Download priority, lowest first. Defaults to 0.
+            size (int, optional): Display size of the preview, None for full size. Defaults to None.
+        """
+        key = (entity.id, size)
+        with self.__lock:
+            request = self.__pending.get(key, None)
+            if(request == None):
+                request = [entity, priority, []]
+                self.__pending[key] = request
+                self.__queue.put((priority, next(self.__order), key))
+            elif(priority < request[1]):
+                # The old queue item will be skipped.
+                request[1] = priority
+                self.__queue.put((priority, next(self.__order), key))
+
+            if(callback != None and callback not in request[2]):
+                request[2].append(callback)
+
+            self.startWorkers()
+
+    def clear(self):
+        """Remove all pending requests, downloads already started are finished.
+        """
+        with self.__lock:
+            self.__pending = {}
+
+    def startWorkers(self):
+        """Start the background workers if needed.
+        """
+        while(len(self.__workers) < self.__maxWorkers):
+            thread = threading.Thread(target=self.work)
+            thread.daemon = True
+            thread.start()
+            self.__workers.append(thread)
+
+    def work(self):
+        """Worker loop, download previews from the queue.
+        """
+        while True:
+            priority, order, key = self.__queue.get()
+
+            with self.__lock:
+                request = self.__pending.get(key, None)
+                # Skip cancelled requests and outdated priorities.
+                if(request == None or request[1] != priority):
+                    continue
+                del self.__pending[key]
+
+            entity, priority, callbacks = request
+            try:
+                entity.getIcon(size=key[1])
+            except Exception as error:
+                self.__manager.logging.error("%s : Failed to load preview (%s)." % (entity.name, error))
+                entity.setIcon("", size=key[1])
+
+            for callback in callbacks:
+                try:
+                    callback(entity)
+                except Exception as error:
+                    # The receiver may have been removed.
+                    self.__manager.logging.debug("%s : Preview callback failed (%s)." % (entity.name, error))
@@ -5,9 +5,10 @@
     :author:    PiloeGAO (Leo DEPOIX)
     :version:   0.0.4
 """
-import os
+import os, re, threading
 
 from . import IOUtils
+from .pathTemplate import PathTemplate
 
 from Hestia.core.version import Version
 from Hestia.core.task import Task
@@ -21,13 +22,29 @@ class Project():
         id (str, optional): Project's ID. Defaults to "".
         name (str, optional): Project's name. Defaults to "".
         description (str, optional): Project's description. Defaults to "".
+        lazy (bool, optional): Categories load their entities on first access. Defaults to False.
+        loader (function, optional): Function called with the project to load its tasks and categories. Defaults to None.
     """
     def __init__(self, id="", name="", description="", tasks=[], **kwargs):
         # Project name.
         self.__id           = id
         self.__name         = name
         self.__description  = description
-        self.__tasks        = tasks
+        self.__tasks        = list(tasks)
+
+        # Lookup indexes.
+        self.__tasksIndex               = {}
+        self.__categoriesIndex          = {}
+        self.__categoriesNameIndex      = {}
+        self.__entitiesIndex            = {}
+        self.__entitiesCategoryIndex    = {}
+
+        # Flat entities views, rebuilt on read after a change.
+        self.__entitiesViews            = {}
+        self.__entitiesVersion          = 0
+
+        for task in self.__tasks:
+            self.__tasksIndex[task.id] = task
         
         self.__rawDatas = kwargs["rawDatas"] if "rawDatas" in kwargs else ""
 
@@ -42,6 +59,7 @@ class Project():
         # Project categories.
         self.__categories   = []
         self.__currentCategory = 0
+        self.__lazy         = kwargs["lazy"] if "lazy" in kwargs else False
 
         # Project file management.
         self.__supportFileTree = False
@@ -64,6 +82,21 @@ class Project():
             self.__supportFileTree = True
         
         self.__specialCharactersList = [" ", "-", "'", "\"", "`", "^"]
+        self.__specialCharactersPattern = re.compile("|".join([re.escape(character) for character in self.__specialCharactersList]))
+
+        # Templates are parsed once, unknown tokens are reported and kept as written in paths.
+        self.__templates = {}
+        self.__templatesErrors = []
+        if(self.__supportFileTree):
+            self.compileTemplates()
+
+        # Entities that failed to load.
+        self.__loadingErrors = {}
+
+        # Deferred loading of tasks and categories.
+        self.__loader = kwargs["loader"] if "loader" in kwargs else None
+        self.__loaded = self.__loader == None
+        self.__loadingLock = threading.Lock()
     
     @property
     def id(self):
@@ -127,6 +160,7 @@ class Project():
             tasks (list: class:`Tasks`): New tasks.
         """
         self.__tasks = tasks
+        self.__tasksIndex = dict([(task.id, task) for task in tasks])
     
     def addTask(self, newTask):
         """Add a task to project.
@@ -135,6 +169,18 @@ class Project():
             newTask (class: "Task"): New task to add.
         """
         self.__tasks.append(newTask)
+        self.__tasksIndex[newTask.id] = newTask
+    
+    def getTask(self, taskId):
+        """Get a task from its ID.
+
+        Args:
+            taskId (str): Task's ID.
+
+        Returns:
+            class: "Task": Task, None if not found.
+        """
+        return self.__tasksIndex.get(taskId, None)
     
     @property
     def rawDatas(self):
@@ -216,7 +262,15 @@ class Project():
         Args:
             categories (list): Project's categories.
         """
-        self.__categories = categories
+        self.__categories = []
+        self.__categoriesIndex = {}
+        self.__categoriesNameIndex = {}
+        self.__entitiesIndex = {}
+        self.__entitiesCategoryIndex = {}
+        self.invalidateEntities()
+
+        for category in categories:
+            self.addCategory(category)
     
     @property
     def currentCategory(self):
@@ -237,6 +291,24 @@ class Project():
         if(id > 0 and id < len(self.__categories)):
             self.__currentCategory = id
     
+    @property
+    def lazy(self):
+        """Get the lazy loading status of the project.
+
+        Returns:
+            bool: Is categories loaded on first access.
+        """
+        return self.__lazy
+    
+    @property
+    def loadedCategories(self):
+        """Get the categories with entities already loaded.
+
+        Returns:
+            list: Loaded categories.
+        """
+        return [category for category in self.__categories if category.loaded]
+    
     def addCategory(self, newCategory):
         """Add a category to project.
 
@@ -244,21 +316,209 @@ class Project():
             newCategory (class: "Category"): New category to add.
         """
         self.__categories.append(newCategory)
+        self.__categoriesIndex[newCategory.id] = newCategory
+        self.__categoriesNameIndex[newCategory.name] = newCategory
+        self.invalidateEntities()
+
+        # Entities added later to the category will be indexed by the category.
+        newCategory.project = self
+        if(newCategory.loaded):
+            for entity in newCategory.entities:
+                self.indexEntity(entity, newCategory)
+    
+    def getCategory(self, categoryId):
+        """Get a category from its ID.
+
+        Args:
+            categoryId (str): Category's ID.
+
+        Returns:
+            class: "Category": Category, None if not found.
+        """
+        return self.__categoriesIndex.get(categoryId, None)
+    
+    def getCategoryByName(self, name):
+        """Get a category from its name.
+
+        Args:
+            name (str): Category's name.
+
+        Returns:
+            class: "Category": Category, None if not found.
+        """
+        return self.__categoriesNameIndex.get(name, None)
+    
+    def getEntity(self, entityId):
+        """Get an entity from its ID, only entities of loaded categories are available.
+
+        Args:
+            entityId (str): Entity's ID.
+
+        Returns:
+            class: "Entity": Entity, None if not found.
+        """
+        return self.__entitiesIndex.get(entityId, None)
+    
+    def getEntityCategory(self, entityId):
+        """Get the category of an entity from the entity ID.
+
+        Args:
+            entityId (str): Entity's ID.
+
+        Returns:
+            class: "Category": Category, None if not found.
+        """
+        return self.__entitiesCategoryIndex.get(entityId, None)
+    
+    def indexEntity(self, entity, category):
+        """Add an entity to the lookup indexes, called by categories.
+
+        Args:
+            entity (class: "Entity"): Entity.
+            category (class: "Category"): Category of the entity.
+        """
+        self.__entitiesIndex[entity.id] = entity
+        self.__entitiesCategoryIndex[entity.id] = category
+        self.invalidateEntities()
+    
+    def unindexEntity(self, entity):
+        """Remove an entity from the lookup indexes, called by categories.
+
+        Args:
+            entity (class: "Entity"): Entity.
+        """
+        if(self.__entitiesIndex.get(entity.id, None) == entity):
+            del self.__entitiesIndex[entity.id]
+            del self.__entitiesCategoryIndex[entity.id]
+            self.invalidateEntities()
+    
+    def invalidateEntities(self):
+        """Mark the flat entities views as outdated, they will be rebuilt on next read.
+        """
+        self.__entitiesVersion += 1
+        self.__entitiesViews = {}
+    
+    def getEntitiesByType(self, entityType=None):
+        """Get entities of the project from a category type.
+        In lazy mode, this loads every category of this type that isn't already loaded.
+
+        Args:
+            entityType (str, optional): Category type ("Assets" or "Shots"), None for all. Defaults to None.
+
+        Returns:
+            list:`class:Entity`: Entities from the project.
+        """
+        categories = [category for category in self.categories if entityType == None or category.type == entityType]
+
+        # Load categories before building the view, loading invalidates it.
+        for category in categories:
+            category.load()
+
+        view = self.__entitiesViews.get(entityType, None)
+        if(view != None):
+            return view
+
+        version = self.__entitiesVersion
+        view = []
+        for category in categories:
+            view.extend(category.entities)
+
+        # Don't keep a view built while the project changed.
+        if(version == self.__entitiesVersion):
+            self.__entitiesViews[entityType] = view
+
+        return view
     
     @property
     def entities(self):
         """Get all entities stored in the project.
+        In lazy mode, this loads every category that isn't already loaded.
 
         Returns:
             list:`class:Entity`: Entities from the project.
         """
-        # TODO: Move to comprehensive list.
-        entities = []
-        if(len(self.categories) > 0):
-            for category in self.__categories:
-                for entity in category.entities:
-                    entities.append(entity)
-        return entities
+        return self.getEntitiesByType()
+
+    @property
+    def assets(self):
+        """Get all assets stored in the project.
+
+        Returns:
+            list:`class:Entity`: Assets from the project.
+        """
+        return self.getEntitiesByType("Assets")
+
+    @property
+    def shots(self):
+        """Get all shots stored in the project.
+
+        Returns:
+            list:`class:Entity`: Shots from the project.
+        """
+        return self.getEntitiesByType("Shots")
+
+    @property
+    def loader(self):
+        """Get the function used to load tasks and categories.
+
+        Returns:
+            function: Loader function.
+        """
+        return self.__loader
+    
+    @loader.setter
+    def loader(self, loader):
+        """Set the function used to load tasks and categories.
+
+        Args:
+            loader (function): Function called with the project.
+        """
+        self.__loader = loader
+        self.__loaded = loader == None
+    
+    @property
+    def loaded(self):
+        """Get the loading status of tasks and categories.
+
+        Returns:
+            bool: Is project loaded.
+        """
+        return self.__loaded
+    
+    def load(self):
+        """Load tasks and categories with the loader if not already done.
+        Wait for the end of the loading if it's running in another thread.
+
+        Returns:
+            bool: Is project loaded.
+        """
+        if(self.__loaded):
+            return True
+
+        with self.__loadingLock:
+            if(not self.__loaded):
+                self.__loader(self)
+                self.__loaded = True
+        
+        return True
+
+    @property
+    def loadingErrors(self):
+        """Get the errors raised while loading entities.
+
+        Returns:
+            dict: Errors by entity ID.
+        """
+        return self.__loadingErrors
+    
+    def addLoadingError(self, entityId, error):
+        """Store an error raised while loading an entity.
+
+        Args:
+            entityId (str): Entity's ID.
+            error (class: "Exception"): Error raised.
+        """
+        self.__loadingErrors[entityId] = error
 
     @property
     def outputFilenameAsset(self):
@@ -332,6 +592,44 @@ class Project():
         """
         return self.__mountPoint + self.__rootPoint + os.sep + self.__workingFolderPathShot.replace("<Project>", self.__name, 1)
     
+    def compileTemplates(self):
+        """Parse the file tree templates of the project.
+        """
+        rootPath = self.__mountPoint + self.__rootPoint + os.sep
+        templates = (("folder", "output", "Assets", rootPath + self.__outputFolderPathAsset),
+                    ("folder", "output", "Shots", rootPath + self.__outputFolderPathShot),
+                    ("folder", "working", "Assets", rootPath + self.__workingFolderPathAsset),
+                    ("folder", "working", "Shots", rootPath + self.__workingFolderPathShot),
+                    ("file", "output", "Assets", self.__outputFilenameAsset),
+                    ("file", "output", "Shots", self.__outputFilenameShot),
+                    ("file", "working", "Assets", self.__workingFilenameAsset),
+                    ("file", "working", "Shots", self.__workingFilenameShot))
+        
+        tokens = {
+            "Assets": ["Project", "AssetType", "Asset", "TaskType", "Version"],
+            "Shots": ["Project", "Sequence", "Shot", "TaskType", "Version"]
+        }
+
+        self.__templates = {}
+        self.__templatesErrors = []
+        for kind, exportType, entityType, template in templates:
+            compiledTemplate = PathTemplate(template, tokens=tokens[entityType])
+            if(not compiledTemplate.isValid):
+                self.__templatesErrors.append("%s %s template for %s use unknown tokens: %s" % (exportType, kind, entityType.lower(), ", ".join(compiledTemplate.unknownTokens)))
+
+            self.__templates[(kind, exportType, entityType, False)] = compiledTemplate
+            # Folders can also be built without the version folder.
+            self.__templates[(kind, exportType, entityType, True)] = PathTemplate(template.replace("/<Version>", ""), tokens=tokens[entityType])
+    
+    @property
+    def templatesErrors(self):
+        """Get the errors found while parsing the file tree templates, unknown tokens are rendered as written.
+
+        Returns:
+            list: str: Errors messages.
+        """
+        return self.__templatesErrors
+
     def getLastVersion(self, entity, taskType):
         """Find the next version for publishing
 
@@ -342,13 +640,7 @@ class Project():
         Returns:
             int: Version number.
         """
-        versionNumber = 0
-        for version in entity.versions:
-            if(version.task.id == taskType.id and version.revisionNumber > versionNumber):
-                versionNumber = version.revisionNumber
-        versionNumber = versionNumber + 1
-
-        return versionNumber
+        return entity.getLastRevision(taskType.id) + 1
 
     def getFolderpath(self, exportType="output", category=None, entity=None, taskType=None, versionNumber=-1, **kwargs):
         """Get the folderpath for entity.
@@ -363,54 +655,7 @@ class Project():
         Returns:
             str: Folder path.
         """
-        categoryName = category.name
-        entityName = entity.name
-        taskName = taskType.name.lower()
-
-        # This is need because our production filetree on IZES isn't correctly setup.
-        if(entity.type == "Assets"):
-            categoryName = categoryName.lower()
-
-        for specialCharacter in self.__specialCharactersList:
-            categoryName = categoryName.replace(specialCharacter, "_")
-            entityName = entityName.replace(specialCharacter, "_")
-            taskName = taskName.replace(specialCharacter, "_")
-
-        path = ""
-
-        if(versionNumber == -1):
-            # Find the last version number automaticly.
-            versionNumber = self.getLastVersion(entity=entity, taskType=taskType)
-
-        if(exportType == "output"):
-            if(category.type == "Assets"):
-                path = self.outputFolderpathAsset
-                path = path.replace("<AssetType>", categoryName)
-                path = path.replace("<Asset>", entityName)
-            else:
-                path = self.outputFolderpathShot
-                path = path.replace("<Sequence>", categoryName)
-                path = path.replace("<Shot>", entityName)
-        elif(exportType == "working"):
-            if(category.type == "Assets"):
-                path = self.workingFolderpathAsset
-                path = path.replace("<AssetType>", categoryName)
-                path = path.replace("<Asset>", entityName)
-            else:
-                path = self.workingFolderpathShot
-                path = path.replace("<Sequence>", categoryName)
-                path = path.replace("<Shot>", entityName)
-        else:
-            return "%s_%s_%s_V%03d/" % (categoryName, entityName, taskName, versionNumber)
-        
-        path = path.replace("<TaskType>", taskName)
-
-        if("withoutVersion" in kwargs):
-            path = path.replace("/<Version>", "")
-        else:
-            path = path.replace("<Version>", "V%03d" % versionNumber)
-
-        return path
+        return self.renderPaths("folder", exportType, [(category, entity, taskType, versionNumber)], withoutVersion="withoutVersion" in kwargs)[0]
 
     def getFilename(self, exportType="output", category=None, entity=None, taskType=None, versionNumber=-1):
         """Get the filename for the entity.
@@ -425,60 +670,114 @@ class Project():
         Returns:
             str: File name.
         """
-        categoryName = category.name.lower()
-        entityName = entity.name
-        taskName = taskType.name.lower()
+        return self.renderPaths("file", exportType, [(category, entity, taskType, versionNumber)])[0]
+    
+    def getFolderpaths(self, exportType="output", items=[], withoutVersion=False):
+        """Get the folderpaths of many entities at once.
+
+        Args:
+            exportType (str, optional): Export type, "output" ou "working". Defaults to "output".
+            items (list, optional): (class:`Entity`, class:`Task`, int) for each path, use "-1" as version for autocount. Defaults to [].
+            withoutVersion (bool, optional): Remove the version folder. Defaults to False.
+
+        Returns:
+            list: str: Folder paths, in the same order as items, empty for entities not in the project.
+        """
+        return self.renderPaths("folder", exportType, [(self.getEntityCategory(entity.id), entity, taskType, versionNumber) for entity, taskType, versionNumber in items], withoutVersion=withoutVersion)
+    
+    def getFilenames(self, exportType="output", items=[]):
+        """Get the filenames of many entities at once.
 
-        for specialCharacter in self.__specialCharactersList:
-            categoryName = categoryName.replace(specialCharacter, "_")
-            entityName = entityName.replace(specialCharacter, "_")
-            taskName = taskName.replace(specialCharacter, "_")
+        Args:
+            exportType (str, optional): Export type, "output" ou "working". Defaults to "output".
+            items (list, optional): (class:`Entity`, class:`Task`, int) for each filename, use "-1" as version for autocount. Defaults to [].
 
-        filename = ""
+        Returns:
+            list: str: File names, in the same order as items, empty for entities not in the project.
+        """
+        return self.renderPaths("file", exportType, [(self.getEntityCategory(entity.id), entity, taskType, versionNumber) for entity, taskType, versionNumber in items])
+    
+    def renderPaths(self, kind, exportType, items, withoutVersion=False):
+        """Render file tree templates.
 
-        if(versionNumber == -1):
-            # Find the last version number automaticly.
-            versionNumber = self.getLastVersion(entity=entity, taskType=taskType)
+        Args:
+            kind (str): Template kind, "folder" or "file".
+            exportType (str): Export type, "output" ou "working".
+            items (list): (class:`Category`, class:`Entity`, class:`Task`, int) for each path, category is None for entities not in the project.
+            withoutVersion (bool, optional): Remove the version folder. Defaults to False.
+
+        Returns:
+            list: str: Rendered paths, in the same order as items, empty for entities not in the project.
+        """
+        if(len(self.__templates) == 0):
+            self.compileTemplates()
+
+        # Names are shared by many paths, sanitize each of them once.
+        names = {}
+        def sanitize(name):
+            if(name not in names):
+                names[name] = self.__specialCharactersPattern.sub("_", name)
+            return names[name]
+
+        paths = []
+        for category, entity, taskType, versionNumber in items:
+            if(category == None):
+                # Entity not indexed in the project.
+                paths.append("")
+                continue
+
+            categoryName = category.name
+            # This is need because our production filetree on IZES isn't correctly setup.
+            if(kind == "file" or entity.type == "Assets"):
+                categoryName = categoryName.lower()
+
+            categoryName = sanitize(categoryName)
+            entityName = sanitize(entity.name)
+            taskName = sanitize(taskType.name.lower())
+
+            if(versionNumber == -1):
+                # Find the last version number automaticly.
+                versionNumber = self.getLastVersion(entity=entity, taskType=taskType)
+
+            if(exportType not in ("output", "working")):
+                paths.append("%s_%s_%s_V%03d%s" % (categoryName, entityName, taskName, versionNumber, "/" if kind == "folder" else ""))
+                continue
+
+            values = {
+                "Project": self.__name,
+                "TaskType": taskName,
+                "Version": "V%03d" % versionNumber
+            }
 
-        if(exportType == "output"):
-            if(category.type == "Assets"):
-                filename = self.outputFilenameAsset
-                filename = filename.replace("<AssetType>", categoryName)
-                filename = filename.replace("<Asset>", entityName)
-            else:
-                filename = self.outputFilenameShot
-                filename = filename.replace("<Sequence>", categoryName)
-                filename = filename.replace("<Shot>", entityName)
-        elif(exportType == "working"):
             if(category.type == "Assets"):
-                filename = self.workingFilenameAsset
-                filename = filename.replace("<AssetType>", categoryName)
-                filename = filename.replace("<Asset>", entityName)
+                values["AssetType"] = categoryName
+                values["Asset"] = entityName
             else:
-                filename = self.outputFilenameShot
-                filename = filename.replace("<Sequence>", categoryName)
-                filename = filename.replace("<Shot>", entityName)
-        else:
-            return "%s_%s_%s_V%03d" % (categoryName, entityName, taskName, versionNumber)
-        
-        filename = filename.replace("<TaskType>", taskName)
-        filename = filename.replace("<Version>", "V%03d" % versionNumber)
+                values["Sequence"] = categoryName
+                values["Shot"] = entityName
+
+            paths.append(self.__templates[(kind, exportType, category.type, withoutVersion and kind == "folder")].render(values))
 
-        return filename
+        return paths
     
-    def buildFolderTree(self):
-        """Build the foldertree for the project.
+    def buildFolderTree(self, maxWorkers=8, dryRun=False):
+        """Build the foldertree for the project, for the tasks assigned to each entity.
+
+        Args:
+            maxWorkers (int, optional): Maximum number of folders checked or created at the same time. Defaults to 8.
+            dryRun (bool, optional): Only report folders that would be created. Defaults to False.
 
         Returns:
-            bool: Status.
+            dict: Report from "IOUtils.makeFolders".
         """
-        for category in self.__categories:
-            for entity in category.entities:
-                for task in self.__tasks:
-                    IOUtils.makeFolder(self.getFolderpath(exportType="working", category=category, entity=entity, taskType=task, versionNumber=-1, withoutVersion=True))
-                    IOUtils.makeFolder(self.getFolderpath(exportType="output", category=category, entity=entity, taskType=task, versionNumber=-1, withoutVersion=True))
-        
-        return True
+        # Version isn't used in paths without version folder.
+        items = [(entity, task, 0) for entity in self.entities for task in entity.tasks]
+
+        paths = self.getFolderpaths(exportType="working", items=items, withoutVersion=True)
+        paths += self.getFolderpaths(exportType="output", items=items, withoutVersion=True)
+        paths = [path for path in paths if path != ""]
+
+        return IOUtils.makeFolders(paths, maxWorkers=maxWorkers, dryRun=dryRun)
 
     @property
     def supportFileTree(self):
@@ -0,0 +1,143 @@
+"""
+    :package:   Hestia
+    :file:      rateLimiter.py
+    :brief:     Client side limiter of online requests.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import time, random
+import threading
+
+class RateLimiter():
+    """Rate limiter class, limit the rate and the number of requests running at the same time.
+
+    The rate is limited by a token bucket, the concurrency follows an AIMD rule:
+    the limit grows by one request each time a full window of requests succeed
+    and is halved when the server is overloaded (throttled, server errors or slow responses).
+
+    Args:
+        rate (float, optional): Requests per second, 0 to disable the rate limit. Defaults to 20.
+        burst (int, optional): Maximum number of requests sent at once after an idle time. Defaults to 40.
+        maxConcurrency (int, optional): Maximum number of requests running at the same time. Defaults to 8.
+        latencyLimit (float, optional): Latency in seconds considered as an overload, 0 to disable. Defaults to 5.
+        backoff (float, optional): Delay of the first retry in seconds. Defaults to 0.5.
+        maxBackoff (float, optional): Maximum delay between retries in seconds. Defaults to 30.
+        logging (class: "logging.Logger", optional): Logger used for debug messages. Defaults to None.
+    """
+    def __init__(self, rate=20, burst=40, maxConcurrency=8, latencyLimit=5, backoff=0.5, maxBackoff=30, logging=None):
+        self.__rate = float(rate)
+        self.__burst = max(1.0, float(burst))
+        self.__maxConcurrency = max(1, int(maxConcurrency))
+        self.__latencyLimit = float(latencyLimit)
+        self.__backoff = float(backoff)
+        self.__maxBackoff = float(maxBackoff)
+        self.__logging = logging
+
+        self.__condition = threading.Condition()
+
+        self.__tokens = self.__burst
+        self.__lastRefill = time.time()
+
+        # Start slowly, the limit grows if the server is healthy.
+        self.__limit = float(max(1, self.__maxConcurrency // 2))
+        self.__running = 0
+        self.__lastDecrease = 0.0
+
+    @property
+    def limit(self):
+        """Get the current concurrency limit.
+
+        Returns:
+            int: Number of requests allowed at the same time.
+        """
+        return int(self.__limit)
+
+    @property
+    def running(self):
+        """Get the number of requests running.
+
+        Returns:
+            int: Number of requests.
+        """
+        return self.__running
+
+    def refill(self):
+        """Add the tokens earned since the last refill, the condition need to be acquired.
+        """
+        now = time.time()
+        self.__tokens = min(self.__burst, self.__tokens + (now - self.__lastRefill) * self.__rate)
+        self.__lastRefill = now
+
+    def acquire(self):
+        """Wait for a free slot and a token, called before each request.
+        """
+        with self.__condition:
+            while True:
+                if(self.__running < int(self.__limit)):
+                    if(self.__rate <= 0):
+                        break
+
+                    self.refill()
+                    if(self.__tokens >= 1):
+                        self.__tokens -= 1
+                        break
+
+                    # Wait for the next token.
+                    self.__condition.wait((1 - self.__tokens) / self.__rate)
+                else:
+                    self.__condition.wait()
+
+            self.__running += 1
+
+    def release(self, overloaded=False, latency=0.0):
+        """Free a slot and update the concurrency limit, called after each request.
+
+        Args:
+            overloaded (bool, optional): Is the server overloaded (429 or 5xx). Defaults to False.
+            latency (float, optional): Duration of the request in seconds. Defaults to 0.0.
+        """
+        with self.__condition:
+            self.__running -= 1
+
+            if(self.__latencyLimit > 0 and latency > self.__latencyLimit):
+                overloaded = True
+
+            oldLimit = int(self.__limit)
+            if(overloaded):
+                # Requests in flight fail together, the limit is decreased once per second.
+                now = time.time()
+                if(now - self.__lastDecrease > 1.0):
+                    self.__limit = max(1.0, self.__limit / 2)
+                    self.__lastDecrease = now
+            else:
+                self.__limit = min(float(self.__maxConcurrency), self.__limit + 1.0 / self.__limit)
+
+            if(int(self.__limit) != oldLimit):
+                self.log("Requests concurrency limit: %i (%i running, latency %.2fs)." % (int(self.__limit), self.__running, latency))
+
+            self.__condition.notify_all()
+
+    def log(self, message):
+        """Send a debug message.
+
+        Args:
+            message (str): Message.
+        """
+        if(self.__logging != None):
+            self.__logging.debug(message)
+
+    def getBackoff(self, attempt, retryAfter=None):
+        """Get the delay before a retry, exponential with full jitter.
+
+        Args:
+            attempt (int): Number of failed attempts.
+            retryAfter (float, optional): Delay asked by the server in seconds. Defaults to None.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        delay = random.uniform(0, min(self.__maxBackoff, self.__backoff * (2 ** attempt)))
+        if(retryAfter != None):
+            delay = max(delay, min(self.__maxBackoff, retryAfter))
+
+        return delay
@@ -0,0 +1,252 @@
+"""
+    :package:   Hestia
+    :file:      requestCache.py
+    :brief:     Bounded cache of online requests results.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import json, time
+import threading
+
+from collections import OrderedDict
+
+class RequestCache():
+    """Request cache class, store the results of online requests in memory.
+
+    Results are stored as JSON strings: the memory used is known and callers
+    always get their own copy of the datas.
+    Each endpoint has its own time to live, least recently used results are
+    removed when the cache is bigger than its maximum size.
+    Concurrent calls of the same request share a single request in flight.
+
+    Args:
+        maxSize (int, optional): Maximum size of the cache in bytes. Defaults to 50MB.
+        defaultTtl (float, optional): Time to live of results in seconds. Defaults to 60.
+        ttls (dict, optional): Time to live by endpoint, 0 to never cache an endpoint. Defaults to {}.
+    """
+    def __init__(self, maxSize=50 * 1024 * 1024, defaultTtl=60, ttls={}):
+        self.__maxSize = int(maxSize)
+        self.__defaultTtl = float(defaultTtl)
+        self.__ttls = dict(ttls)
+
+        self.__lock = threading.Lock()
+        # Entries by key: [datas, size, expiration date].
+        self.__entries = OrderedDict()
+        self.__size = 0
+
+        # Requests in flight by key: [done event, datas, result, error].
+        self.__inFlight = {}
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+        self.__coalesced = 0
+
+    @property
+    def maxSize(self):
+        """Get the maximum size of the cache.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return self.__maxSize
+
+    @maxSize.setter
+    def maxSize(self, maxSize):
+        """Set the maximum size of the cache.
+
+        Args:
+            maxSize (int): Size in bytes.
+        """
+        with self.__lock:
+            self.__maxSize = int(maxSize)
+            self.evict()
+
+    @property
+    def size(self):
+        """Get the memory used by the cache.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return self.__size
+
+    @property
+    def stats(self):
+        """Get the cache counters.
+
+        Returns:
+            dict: Entries, size, hits, misses, evictions, expirations and coalesced calls.
+        """
+        return {
+            "entries": len(self.__entries),
+            "size": self.__size,
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "expirations": self.__expirations,
+            "coalesced": self.__coalesced
+        }
+
+    def getTtl(self, endpoint):
+        """Get the time to live of an endpoint.
+
+        Args:
+            endpoint (str): Endpoint name.
+
+        Returns:
+            float: Time to live in seconds.
+        """
+        return self.__ttls.get(endpoint, self.__defaultTtl)
+
+    def getKey(self, endpoint, function, args, kwargs):
+        """Build the key of a request.
+
+        Args:
+            endpoint (str): Endpoint name.
+            function (function): Function doing the request.
+            args (tuple): Arguments of the function.
+            kwargs (dict): Keyword arguments of the function.
+
+        Returns:
+            str: Key.
+        """
+        arguments = json.dumps([args, kwargs], sort_keys=True, default=str)
+        return "%s|%s.%s|%s" % (endpoint, getattr(function, "__module__", ""), getattr(function, "__name__", ""), arguments)
+
+    def call(self, endpoint, function, *args, **kwargs):
+        """Get the result of a request from the cache, the request is done if not cached.
+
+        If the same request is already in flight, the call waits for it and shares its result.
+
+        Args:
+            endpoint (str): Endpoint name (example: "assets"), used for time to live and invalidation.
+            function (function): Function doing the request.
+
+        Returns:
+            object: Request result.
+        """
+        ttl = self.getTtl(endpoint)
+        key = self.getKey(endpoint, function, args, kwargs)
+
+        with self.__lock:
+            entry = self.__entries.get(key, None)
+            if(entry != None and entry[2] < time.time()):
+                self.removeEntry(key)
+                self.__expirations += 1
+                entry = None
+
+            flight = None
+            leader = False
+            if(entry != None):
+                # Move the entry to the most recently used end.
+                del self.__entries[key]
+                self.__entries[key] = entry
+                self.__hits += 1
+            elif(key in self.__inFlight):
+                flight = self.__inFlight[key]
+                self.__coalesced += 1
+            else:
+                flight = [threading.Event(), None, None, None]
+                self.__inFlight[key] = flight
+                leader = True
+                if(ttl > 0):
+                    self.__misses += 1
+
+        if(entry != None):
+            return json.loads(entry[0])
+
+        if(not leader):
+            flight[0].wait()
+            if(flight[3] != None):
+                raise flight[3]
+            if(flight[1] != None):
+                return json.loads(flight[1])
+            # Not serializable, the result is shared.
+            return flight[2]
+
+        try:
+            result = function(*args, **kwargs)
+        except Exception as error:
+            flight[3] = error
+            with self.__lock:
+                del self.__inFlight[key]
+            flight[0].set()
+            raise
+
+        try:
+            datas = json.dumps(result)
+        except (TypeError, ValueError):
+            # Not serializable, never cached.
+            datas = None
+
+        with self.__lock:
+            # Stored before the flight ends, next calls find the entry.
+            if(datas != None and ttl > 0):
+                if(key in self.__entries):
+                    self.removeEntry(key)
+
+                size = len(datas) + len(key)
+                if(size <= self.__maxSize):
+                    self.__entries[key] = [datas, size, time.time() + ttl]
+                    self.__size += size
+                    self.evict()
+
+            del self.__inFlight[key]
+
+        flight[1] = datas
+        flight[2] = result
+        flight[0].set()
+
+        return json.loads(datas) if datas != None else result
+
+    def removeEntry(self, key):
+        """Remove an entry, the lock need to be acquired.
+
+        Args:
+            key (str): Key.
+        """
+        entry = self.__entries.pop(key)
+        self.__size -= entry[1]
+
+    def evict(self):
+        """Remove least recently used entries until the cache fit in its maximum size, the lock need to be acquired.
+        """
+        while(self.__size > self.__maxSize and len(self.__entries) > 0):
+            key = next(iter(self.__entries))
+            self.removeEntry(key)
+            self.__evictions += 1
+
+    def invalidate(self, endpoints=None, ids=None):
+        """Remove cached results, called when online datas are modified.
+
+        Args:
+            endpoints (list, optional): Endpoints to invalidate, None for all. Defaults to None.
+            ids (list, optional): Only remove results of requests using one of these IDs, None for all. Defaults to None.
+
+        Returns:
+            int: Number of results removed.
+        """
+        ids = list(ids) if ids != None else None
+
+        with self.__lock:
+            keys = []
+            for key in self.__entries:
+                if(endpoints != None and key.split("|", 1)[0] not in endpoints):
+                    continue
+                if(ids != None and not any([id in key for id in ids])):
+                    continue
+                keys.append(key)
+
+            for key in keys:
+                self.removeEntry(key)
+
+        return len(keys)
+
+    def clear(self):
+        """Remove all cached results.
+        """
+        with self.__lock:
+            self.__entries = OrderedDict()
+            self.__size = 0
@@ -0,0 +1,216 @@
+"""
+    :package:   Hestia
+    :file:      snapshot.py
+    :brief:     On-disk snapshot of a project raw datas.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import os, json
+import sqlite3
+
+class ProjectSnapshot():
+    """Project snapshot class, store raw datas rows in a SQLite file.
+
+    Each row is stored with a kind (example: "assets"), an ID, the ID of the
+    entity it belongs to and its last update date.
+
+    Args:
+        path (str): Path of the snapshot file.
+    """
+    def __init__(self, path):
+        self.__path = path
+        self.__schemaVersion = 1
+
+    @property
+    def path(self):
+        """Get the path of the snapshot file.
+
+        Returns:
+            str: File path.
+        """
+        return self.__path
+
+    @property
+    def schemaVersion(self):
+        """Get the schema version used by this class.
+
+        Returns:
+            int: Schema version.
+        """
+        return self.__schemaVersion
+
+    @property
+    def isValid(self):
+        """Check if the snapshot file exists and use the current schema.
+
+        Returns:
+            bool: Snapshot status.
+        """
+        if(not os.path.isfile(self.__path)):
+            return False
+
+        try:
+            schemaVersion = self.getInfo("schemaVersion")
+        except sqlite3.Error:
+            return False
+
+        return schemaVersion == str(self.__schemaVersion) and self.getInfo("complete") == "1"
+
+    def connect(self):
+        """Open a connection to the snapshot file.
+
+        Returns:
+            class: "sqlite3.Connection": Connection.
+        """
+        folder = os.path.dirname(self.__path)
+        if(folder != "" and not os.path.isdir(folder)):
+            os.makedirs(folder)
+
+        return sqlite3.connect(self.__path, timeout=30)
+
+    def clear(self):
+        """Remove all datas and create an empty snapshot with the current schema.
+        """
+        connection = self.connect()
+        try:
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS infos")
+                connection.execute("DROP TABLE IF EXISTS datas")
+                connection.execute("CREATE TABLE infos (key TEXT PRIMARY KEY, value TEXT)")
+                connection.execute("CREATE TABLE datas (kind TEXT, id TEXT, entityId TEXT, updatedAt TEXT, data TEXT, PRIMARY KEY (kind, id))")
+                connection.execute("CREATE INDEX datasEntity ON datas (kind, entityId)")
+                connection.execute("INSERT INTO infos VALUES (?, ?)", ("schemaVersion", str(self.__schemaVersion)))
+        finally:
+            connection.close()
+
+    def getInfo(self, key, default=None):
+        """Get a value from the snapshot informations.
+
+        Args:
+            key (str): Information key.
+            default (str, optional): Value returned if the key doesn't exist. Defaults to None.
+
+        Returns:
+            str: Value.
+        """
+        connection = self.connect()
+        try:
+            row = connection.execute("SELECT value FROM infos WHERE key = ?", (key,)).fetchone()
+        finally:
+            connection.close()
+
+        return row[0] if row != None else default
+
+    def setInfo(self, key, value):
+        """Set a value in the snapshot informations.
+
+        Args:
+            key (str): Information key.
+            value (str): Value.
+        """
+        connection = self.connect()
+        try:
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO infos VALUES (?, ?)", (key, str(value)))
+        finally:
+            connection.close()
+
+    def getDatas(self, kind, entityIds=None, ids=None):
+        """Get datas rows of a kind.
+
+        Args:
+            kind (str): Datas kind.
+            entityIds (list, optional): Only return rows of these entities. Defaults to None.
+            ids (list, optional): Only return rows with these IDs. Defaults to None.
+
+        Returns:
+            list: Datas.
+        """
+        query = "SELECT data FROM datas WHERE kind = ?"
+        filterIds = None
+        if(entityIds != None):
+            query += " AND entityId IN (%s)"
+            filterIds = list(entityIds)
+        elif(ids != None):
+            query += " AND id IN (%s)"
+            filterIds = list(ids)
+
+        datas = []
+        connection = self.connect()
+        try:
+            if(filterIds == None):
+                rows = connection.execute(query, (kind,)).fetchall()
+            else:
+                # Split the filter to stay under the SQLite variables limit.
+                rows = []
+                for i in range(0, len(filterIds), 500):
+                    chunk = filterIds[i:i + 500]
+                    rows += connection.execute(query % ", ".join(["?"] * len(chunk)), [kind] + chunk).fetchall()
+        finally:
+            connection.close()
+
+        for row in rows:
+            datas.append(json.loads(row[0]))
+
+        return datas
+
+    def setDatas(self, kind, datas, entityKey="id"):
+        """Insert or replace datas rows of a kind.
+
+        Args:
+            kind (str): Datas kind.
+            datas (list): Datas, each one need an "id" key.
+            entityKey (str, optional): Key of the entity ID in datas, None if not linked to an entity. Defaults to "id".
+        """
+        rows = []
+        for data in datas:
+            rows.append((kind,
+                        data["id"],
+                        data[entityKey] if entityKey != None else None,
+                        data["updated_at"] if "updated_at" in data else None,
+                        json.dumps(data)))
+
+        connection = self.connect()
+        try:
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO datas VALUES (?, ?, ?, ?, ?)", rows)
+        finally:
+            connection.close()
+
+    def getUpdateDates(self, kind, ids):
+        """Get the last update date of datas rows.
+
+        Args:
+            kind (str): Datas kind.
+            ids (list): Rows IDs.
+
+        Returns:
+            dict: Update dates by ID.
+        """
+        ids = list(ids)
+        dates = {}
+        connection = self.connect()
+        try:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                query = "SELECT id, updatedAt FROM datas WHERE kind = ? AND id IN (%s)" % ", ".join(["?"] * len(chunk))
+                for row in connection.execute(query, [kind] + chunk).fetchall():
+                    dates[row[0]] = row[1]
+        finally:
+            connection.close()
+
+        return dates
+
+    def removeDatas(self, kind, ids):
+        """Remove datas rows of a kind.
+
+        Args:
+            kind (str): Datas kind.
+            ids (list): Rows IDs.
+        """
+        connection = self.connect()
+        try:
+            with connection:
+                connection.executemany("DELETE FROM datas WHERE kind = ? AND id = ?", [(kind, id) for id in ids])
+        finally:
+            connection.close()
@@ -0,0 +1,133 @@
+"""
+    :package:   Hestia
+    :file:      thumbnailAtlas.py
+    :brief:     Previews packed in a single image.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import json, math, uuid
+
+global atlasSupport
+
+try:
+    from PySide2.QtCore     import Qt
+    from PySide2.QtGui      import QImage, QPainter
+except:
+    try:
+        from PySide.QtCore  import Qt
+        from PySide.QtGui   import QImage, QPainter
+    except:
+        atlasSupport = False
+    else:
+        atlasSupport = True
+else:
+    atlasSupport = True
+
+def getIndexKey(key):
+    """Get the cache key of an atlas index.
+
+    Args:
+        key (str): Atlas key.
+
+    Returns:
+        str: Index key.
+    """
+    return "atlasIndex_" + key
+
+def buildAtlas(cache, key, images, cellSize, datas={}):
+    """Pack images in a single image, each image is stored in a square cell.
+    QImage and QPainter are used as they can be used outside of the UI thread.
+
+    Args:
+        cache (class: "ThumbnailCache"): Cache storing the atlas.
+        key (str): Atlas key.
+        images (list): (str, str) ID and path of each image, images need to fit in a cell.
+        cellSize (int): Size of the cells in pixels.
+        datas (dict, optional): Datas stored with the index (example: images versions). Defaults to {}.
+
+    Returns:
+        dict: Index of the atlas, None if the atlas can't be built.
+    """
+    if(not atlasSupport or len(images) == 0):
+        return None
+
+    columns = int(math.ceil(math.sqrt(len(images))))
+    rows = int(math.ceil(len(images) / float(columns)))
+
+    atlas = QImage(columns * cellSize, rows * cellSize, QImage.Format_ARGB32)
+    atlas.fill(Qt.transparent)
+
+    rects = {}
+    painter = QPainter(atlas)
+    try:
+        cell = 0
+        for imageId, path in images:
+            image = QImage(path)
+            if(image.isNull() or image.width() > cellSize or image.height() > cellSize):
+                continue
+
+            x = (cell % columns) * cellSize
+            y = int(cell / columns) * cellSize
+            painter.drawImage(x, y, image)
+
+            rects[imageId] = [x, y, image.width(), image.height()]
+            cell += 1
+    finally:
+        painter.end()
+
+    if(len(rects) == 0):
+        return None
+
+    def writeAtlas(path):
+        # QImage doesn't raise, the cache must not index a missing file.
+        if(not atlas.save(path, "PNG")):
+            raise IOError("Failed to write %s." % path)
+
+    # Each build use a new image, the old image is left to the cache eviction
+    # so a session reading the old index still find it.
+    imageKey = "atlas_%s_%s" % (key, uuid.uuid4().hex[:8])
+    try:
+        cache.put(imageKey, "png", writeAtlas)
+    except (IOError, OSError):
+        return None
+
+    index = {
+        "image": imageKey,
+        "cellSize": cellSize,
+        "rects": rects,
+        "datas": datas
+    }
+
+    def writeIndex(path):
+        with open(path, "w") as indexFile:
+            json.dump(index, indexFile)
+
+    cache.put(getIndexKey(key), "json", writeIndex)
+
+    return index
+
+def loadAtlas(cache, key):
+    """Get an atlas from the cache.
+
+    Args:
+        cache (class: "ThumbnailCache"): Cache storing the atlas.
+        key (str): Atlas key.
+
+    Returns:
+        tuple: (str, dict): Path of the atlas image and its index, (None, None) if not cached.
+    """
+    indexPath = cache.get(getIndexKey(key))
+    if(indexPath == None):
+        return None, None
+
+    try:
+        with open(indexPath, "r") as indexFile:
+            index = json.load(indexFile)
+    except (IOError, ValueError):
+        return None, None
+
+    imagePath = cache.get(index["image"])
+    if(imagePath == None):
+        return None, None
+
+    return imagePath, index
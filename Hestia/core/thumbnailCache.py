@@ -0,0 +1,295 @@
+"""
+    :package:   Hestia
+    :file:      thumbnailCache.py
+    :brief:     Persistent thumbnails cache.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import os, time, tempfile
+import threading
+
+class ThumbnailCache():
+    """Thumbnail cache class, store files in a folder shared by every session.
+
+    Files are named from a key (example: the preview file ID) and an extension.
+    When the folder is bigger than the maximum size, least recently used files are removed
+    until the cache is back under its low water mark.
+
+    Sizes and access dates are tracked in memory, the modification date of a file is only
+    updated once per touch interval to tell other sessions it is still used.
+
+    The folder may be on a network drive, it's only read from a background thread:
+    once on creation, then when the cache is full or after the scan interval
+    to count the files written by other sessions before evicting.
+
+    Args:
+        path (str): Folder of the cache.
+        maxSize (int, optional): Maximum size of the cache in bytes. Defaults to 200MB.
+        lowWater (float, optional): Part of the maximum size kept after an eviction. Defaults to 0.8.
+        touchInterval (float, optional): Minimum delay between two updates of a file modification date in seconds. Defaults to 3600.
+        scanInterval (float, optional): Maximum delay between two reads of the folder in seconds. Defaults to 300.
+    """
+    def __init__(self, path, maxSize=200 * 1024 * 1024, lowWater=0.8, touchInterval=3600, scanInterval=300):
+        self.__path = path
+        self.__maxSize = int(maxSize)
+        self.__lowWater = float(lowWater)
+        self.__touchInterval = float(touchInterval)
+        self.__scanInterval = float(scanInterval)
+
+        self.__lock = threading.Lock()
+        # Files by key: [filename, size, last access date, last touch date].
+        self.__files = {}
+        self.__size = 0
+
+        self.__lastScan = 0.0
+        self.__scanning = False
+        # Set once the files of previous sessions are known.
+        self.__scanned = threading.Event()
+
+        self.scanInBackground()
+
+    @property
+    def path(self):
+        """Get the folder of the cache.
+
+        Returns:
+            str: Folder path.
+        """
+        return self.__path
+
+    @property
+    def maxSize(self):
+        """Get the maximum size of the cache.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return self.__maxSize
+
+    @maxSize.setter
+    def maxSize(self, maxSize):
+        """Set the maximum size of the cache.
+
+        Args:
+            maxSize (int): Size in bytes.
+        """
+        self.__maxSize = int(maxSize)
+        self.scanInBackground()
+
+    @property
+    def scanned(self):
+        """Get the scan status, files of previous sessions are unknown until the folder is read.
+
+        Returns:
+            bool: Is the cache folder read.
+        """
+        return self.__scanned.is_set()
+
+    @property
+    def size(self):
+        """Get the size of the cache.
+
+        Returns:
+            int: Size in bytes.
+        """
+        return self.__size
+
+    def scanInBackground(self):
+        """Read the content of the cache folder in a background thread, then evict files if the cache is full.
+        """
+        with self.__lock:
+            if(self.__scanning):
+                return
+            self.__scanning = True
+
+        def scanFolder():
+            try:
+                self.scan()
+                if(self.__size > self.__maxSize):
+                    self.evict()
+            finally:
+                with self.__lock:
+                    self.__scanning = False
+                self.__scanned.set()
+
+        thread = threading.Thread(target=scanFolder)
+        thread.daemon = True
+        thread.start()
+
+    def scan(self):
+        """Read the content of the cache folder, files may be added or removed by other sessions.
+        """
+        start = time.time()
+
+        files = {}
+        if(os.path.isdir(self.__path)):
+            for filename in os.listdir(self.__path):
+                # Skip files being written.
+                if(filename.startswith(".")):
+                    continue
+
+                try:
+                    stat = os.stat(self.__path + os.sep + filename)
+                except OSError:
+                    continue
+
+                files[os.path.splitext(filename)[0]] = [filename, stat.st_size, stat.st_mtime, stat.st_mtime]
+
+        with self.__lock:
+            for key, entry in self.__files.items():
+                if(key in files):
+                    # Access dates of this session are more recent than the modification dates.
+                    files[key][2] = max(files[key][2], entry[2])
+                    files[key][3] = max(files[key][3], entry[3])
+                elif(entry[2] >= start):
+                    # Added after the folder was read.
+                    files[key] = entry
+
+            self.__files = files
+            self.__size = sum([entry[1] for entry in files.values()])
+            self.__lastScan = start
+
+    def get(self, key):
+        """Get the path of a cached file, wait for the first scan if the file isn't known yet.
+
+        Args:
+            key (str): File key.
+
+        Returns:
+            str: File path, None if the file isn't cached.
+        """
+        if(not self.__scanned.is_set() and key not in self.__files):
+            # Files of previous sessions are known once the folder is read,
+            # the UI thread checks "scanned" before to never wait here.
+            self.__scanned.wait()
+
+        now = time.time()
+        with self.__lock:
+            entry = self.__files.get(key, None)
+            if(entry == None):
+                return None
+
+            entry[2] = now
+            touch = now - entry[3] > self.__touchInterval
+            if(touch):
+                entry[3] = now
+
+        path = self.__path + os.sep + entry[0]
+        if(touch):
+            try:
+                # The modification date is used as last access date by other sessions.
+                os.utime(path, None)
+            except OSError:
+                # Removed by another session.
+                with self.__lock:
+                    if(self.__files.get(key, None) is entry):
+                        del self.__files[key]
+                        self.__size -= entry[1]
+                return None
+
+        return path
+
+    def put(self, key, extension, writer):
+        """Add a file to the cache.
+
+        The file is written to a temporary file then moved to its final path,
+        other sessions never read a partially written file.
+
+        Args:
+            key (str): File key.
+            extension (str): File extension, without dot.
+            writer (function): Function called with a path to write the file.
+
+        Returns:
+            str: File path.
+        """
+        if(not os.path.isdir(self.__path)):
+            try:
+                os.makedirs(self.__path)
+            except OSError:
+                # Created by another session.
+                pass
+
+        filename = key + "." + extension
+        path = self.__path + os.sep + filename
+
+        fileDescriptor, temporaryPath = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=self.__path)
+        os.close(fileDescriptor)
+
+        try:
+            writer(temporaryPath)
+
+            if(hasattr(os, "replace")):
+                os.replace(temporaryPath, path)
+            elif(os.path.isfile(path)):
+                # Already written by another session.
+                os.remove(temporaryPath)
+            else:
+                os.rename(temporaryPath, path)
+        except:
+            if(os.path.isfile(temporaryPath)):
+                os.remove(temporaryPath)
+            raise
+
+        size = os.path.getsize(path)
+        now = time.time()
+
+        with self.__lock:
+            # An overwritten file doesn't count twice.
+            oldEntry = self.__files.get(key, None)
+            if(oldEntry != None):
+                self.__size -= oldEntry[1]
+
+            self.__files[key] = [filename, size, now, now]
+            self.__size += size
+            # Files written by other sessions are only counted by a scan.
+            needsScan = self.__size > self.__maxSize or now - self.__lastScan > self.__scanInterval
+
+        if(oldEntry != None and oldEntry[0] != filename):
+            # Same key with another extension.
+            try:
+                os.remove(self.__path + os.sep + oldEntry[0])
+            except OSError:
+                pass
+
+        if(needsScan):
+            self.scanInBackground()
+
+        return path
+
+    def evict(self):
+        """Remove least recently used files until the cache is under its low water mark.
+        The cache folder need to be scanned before to count the files of other sessions.
+        """
+        with self.__lock:
+            target = self.__maxSize * self.__lowWater
+            removed = []
+            for key, entry in sorted(self.__files.items(), key=lambda item: item[1][2]):
+                if(self.__size <= target):
+                    break
+
+                del self.__files[key]
+                self.__size -= entry[1]
+                removed.append(entry[0])
+
+        for filename in removed:
+            try:
+                os.remove(self.__path + os.sep + filename)
+            except OSError:
+                # Removed by another session.
+                continue
+
+    def clear(self):
+        """Remove all files from the cache.
+        """
+        if(os.path.isdir(self.__path)):
+            for filename in os.listdir(self.__path):
+                if(filename.startswith(".")):
+                    continue
+
+                try:
+                    os.remove(self.__path + os.sep + filename)
+                except OSError:
+                    pass
+
+        self.scan()
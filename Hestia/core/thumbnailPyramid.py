@@ -0,0 +1,96 @@
+"""
+    :package:   Hestia
+    :file:      thumbnailPyramid.py
+    :brief:     Downsampled versions of previews.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+global pyramidSupport
+
+try:
+    from PySide2.QtCore     import Qt
+    from PySide2.QtGui      import QImage
+except:
+    try:
+        from PySide.QtCore  import Qt
+        from PySide.QtGui   import QImage
+    except:
+        pyramidSupport = False
+    else:
+        pyramidSupport = True
+else:
+    pyramidSupport = True
+
+# Sizes of the downsampled previews in pixels.
+pyramidSizes = [64, 128, 256]
+
+def getLevel(size):
+    """Get the smallest pyramid size bigger or equal to a size.
+
+    Args:
+        size (int): Displayed size in pixels.
+
+    Returns:
+        int: Pyramid size.
+    """
+    for level in pyramidSizes:
+        if(level >= size):
+            return level
+
+    return pyramidSizes[-1]
+
+def getLevelKey(key, level):
+    """Get the cache key of a pyramid level.
+
+    Args:
+        key (str): Preview key.
+        level (int): Pyramid size.
+
+    Returns:
+        str: Cache key.
+    """
+    return "%s_%i" % (key, level)
+
+def buildPyramid(cache, key, sourcePath):
+    """Decode a preview once and store it at every pyramid size.
+    QImage is used as it can be used outside of the UI thread.
+
+    Args:
+        cache (class: "ThumbnailCache"): Cache storing the pyramid.
+        key (str): Preview key.
+        sourcePath (str): Path of the full size preview.
+
+    Returns:
+        dict: Paths by pyramid size, empty if the preview can't be decoded, sizes that can't be written are missing.
+    """
+    if(not pyramidSupport):
+        return {}
+
+    image = QImage(sourcePath)
+    if(image.isNull()):
+        return {}
+
+    paths = {}
+    for level in pyramidSizes:
+        path = cache.get(getLevelKey(key, level))
+        if(path == None):
+            # Never upscale small previews.
+            if(image.width() > level or image.height() > level):
+                levelImage = image.scaled(level, level, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            else:
+                levelImage = image
+
+            def writeLevel(path):
+                # QImage doesn't raise, the cache must not index a missing file.
+                if(not levelImage.save(path, "PNG")):
+                    raise IOError("Failed to write %s." % path)
+
+            try:
+                path = cache.put(getLevelKey(key, level), "png", writeLevel)
+            except (IOError, OSError):
+                # Level not available, the full size preview is used instead.
+                continue
+
+        paths[level] = path
+
+    return paths
@@ -0,0 +1,85 @@
+"""
+    :package:   Hestia
+    :file:      workerPool.py
+    :brief:     Bounded thread pool for IO bound jobs.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+import threading
+
+try:
+    import queue
+except:
+    import Queue as queue
+
+class WorkerPool():
+    """Worker pool class.
+
+    Args:
+        maxWorkers (int, optional): Maximum number of jobs running at the same time. Defaults to 8.
+    """
+    def __init__(self, maxWorkers=8):
+        self.__maxWorkers = max(1, int(maxWorkers))
+
+    @property
+    def maxWorkers(self):
+        """Get the maximum number of jobs running at the same time.
+
+        Returns:
+            int: Number of workers.
+        """
+        return self.__maxWorkers
+
+    @maxWorkers.setter
+    def maxWorkers(self, maxWorkers):
+        """Set the maximum number of jobs running at the same time.
+
+        Args:
+            maxWorkers (int): Number of workers.
+        """
+        self.__maxWorkers = max(1, int(maxWorkers))
+
+    def map(self, function, items):
+        """Run a function on every item, in parallel.
+
+        A job raising an exception doesn't stop the other jobs,
+        the exception is returned with the job result.
+
+        Args:
+            function (function): Function called with one item.
+            items (list): Items to process.
+
+        Returns:
+            list: (result, error) for each item, in the same order as items.
+        """
+        items = list(items)
+        results = [(None, None)] * len(items)
+
+        if(len(items) == 0):
+            return results
+
+        jobs = queue.Queue()
+        for index, item in enumerate(items):
+            jobs.put((index, item))
+
+        def worker():
+            while True:
+                try:
+                    index, item = jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    results[index] = (function(item), None)
+                except Exception as error:
+                    results[index] = (None, error)
+
+        workers = [threading.Thread(target=worker) for i in range(min(self.__maxWorkers, len(items)))]
+        for thread in workers:
+            thread.daemon = True
+            thread.start()
+
+        for thread in workers:
+            thread.join()
+
+        return results
@@ -126,8 +126,23 @@ class LoginWindow(QWidget):
         
         self.__manager.preferences.savePreferences()
 
-        # Connecting to online service.
-        self.__connection = self.__manager.connectToOnline(api=self.api.currentValue, username=self.username.currentValue, password=self.password.currentValue)
+        # Connecting to online service, projects are loaded in background.
+        self.errorLabel.hide()
+        self.loginButton.changeButtonStatus(0)
+
+        self.__mainWindow.connectToOnline(api=self.api.currentValue,
+                                            username=self.username.currentValue,
+                                            password=self.password.currentValue,
+                                            functionToInvoke=self.loginFinished)
+    
+    def loginFinished(self, status):
+        """Show the main window once logged in.
+
+        Args:
+            status (bool): Connection status.
+        """
+        self.__connection = status
+        self.loginButton.changeButtonStatus(1)
 
         if (self.__connection):
             # Close this window.
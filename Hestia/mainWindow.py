@@ -23,6 +23,7 @@ from .ui.header             import Header
 from .ui.folderTreeView     import FolderTreeView
 from .ui.contentView        import ContentView
 from .ui.footer             import Footer
+from .ui.loadingWorker      import LoadingWorker
 
 class MainWindow(QWidget):
     """Main Window class.
@@ -58,6 +59,13 @@ class MainWindow(QWidget):
         # Initialize the preference window.
         self.preferencesWindow = None
 
+        # Initialize the projects loading worker.
+        self.loadingWorker = None
+        # Workers loading a single project selected by the user.
+        self.projectWorkers = []
+        # Workers loading a single category selected by the user.
+        self.categoryWorkers = []
+
         # Show online login modal if not set to local.
         self.loginWindow = None
         if(self.__manager.mode != "local" and not self.__manager.link.connected):
@@ -89,6 +97,9 @@ class MainWindow(QWidget):
             event (class: 'QtEvent'): Event.
         """
         if(True):
+            # Stop the projects loading.
+            if(self.loadingWorker != None): self.loadingWorker.cancel()
+
             # Closing other window if Main Window is closed.
             if(self.loginWindow != None): self.loginWindow.hide()
             if(self.preferencesWindow != None): self.preferencesWindow.hide()
@@ -166,6 +177,113 @@ class MainWindow(QWidget):
         self.footer.updateLog(text=text)
         self.footer.refresh()
 
+    @property
+    def loading(self):
+        """Get the status of the projects loading.
+
+        Returns:
+            bool: Is the loading running.
+        """
+        if(self.loadingWorker != None and self.loadingWorker.running):
+            return True
+
+        return any([worker.running for worker in self.projectWorkers + self.categoryWorkers])
+
+    def connectToOnline(self, api="", username="", password="", functionToInvoke=None):
+        """Login and load projects in background.
+
+        Args:
+            api (str, optional): Api to connect. Defaults to "".
+            username (str, optional): Username. Defaults to "".
+            password (str, optional): Password. Defaults to "".
+            functionToInvoke (function, optional): Function called with the login status. Defaults to None.
+        """
+        self.loadingWorker = LoadingWorker(manager=self.__manager, api=api, username=username, password=password, parent=self)
+        self.loadingWorker.progress.connect(self.footer.updateProgress)
+        self.loadingWorker.projectsLoaded.connect(self.projectsLoaded)
+        self.loadingWorker.categoryLoaded.connect(self.categoryLoaded)
+        self.loadingWorker.finished.connect(self.loadingFinished)
+        if(functionToInvoke != None):
+            self.loadingWorker.connected.connect(functionToInvoke)
+        self.loadingWorker.start()
+
+    def projectsLoaded(self, projects, currentProject):
+        """Add the projects built by the loading worker to the manager, in the UI thread.
+
+        Args:
+            projects (list(class: "Project")): Projects.
+            currentProject (int): Index of the current project.
+        """
+        self.__manager.setProjects(projects, currentProject)
+
+    def loadProject(self, project):
+        """Load the tasks and categories of a project in background, the window is refreshed once loaded.
+
+        Args:
+            project (class: "Project"): Project to load.
+        """
+        self.projectWorkers = [worker for worker in self.projectWorkers if worker.running]
+
+        self.updateLog(text="Loading %s..." % project.name)
+
+        worker = LoadingWorker(manager=self.__manager, project=project, parent=self)
+        worker.projectLoaded.connect(self.projectLoaded)
+        worker.finished.connect(self.loadingFinished)
+        self.projectWorkers.append(worker)
+        worker.start()
+
+    def projectLoaded(self, projectId):
+        """Display a project loaded in background if selected.
+
+        Args:
+            projectId (str): Project ID.
+        """
+        project = self.__manager.projects[self.__manager.currentProject]
+        if(project.id != projectId):
+            return
+
+        if(project.loaded):
+            self.updateLog(text="%s loaded." % project.name)
+        else:
+            self.updateLog(text="%s can't be loaded, select the project again to retry." % project.name)
+
+        self.refreshProject()
+
+    def loadCategory(self, category):
+        """Load the entities of a category in background, the content view is refreshed once loaded.
+
+        Args:
+            category (class: "Category"): Category to load.
+        """
+        self.categoryWorkers = [worker for worker in self.categoryWorkers if worker.running]
+
+        self.updateLog(text="Loading %s..." % category.name)
+
+        worker = LoadingWorker(manager=self.__manager, category=category, parent=self)
+        worker.categoryLoaded.connect(self.categoryLoaded)
+        worker.finished.connect(self.loadingFinished)
+        self.categoryWorkers.append(worker)
+        worker.start()
+
+    def categoryLoaded(self, categoryId):
+        """Display the entities of a category loaded in background if selected.
+
+        Args:
+            categoryId (str): Category ID.
+        """
+        project = self.__manager.projects[self.__manager.currentProject]
+        if(len(project.categories) > 0 and project.categories[project.currentCategory].id == categoryId):
+            self.contentView.refresh()
+
+    def loadingFinished(self):
+        """Hide the loading progress at the end of the projects loading.
+        """
+        self.footer.hideProgress()
+
+        # The category can't be loaded anymore in background (example: cancelled loading).
+        if(self.contentView.waitingEntities):
+            self.contentView.refresh()
+
     def refresh(self):
         """Force refresh of the window.
         """
@@ -184,3 +302,11 @@ class MainWindow(QWidget):
         """Refresh the window on category change.
         """
         self.contentView.refresh()
+    
+    def refreshEntity(self, entity):
+        """Refresh the window after an entity update.
+
+        Args:
+            entity (class:`Entity`): Entity updated.
+        """
+        self.contentView.refreshEntity(entity)
@@ -88,6 +88,17 @@ class PreferencesWindow(QWidget):
             self.buildProjectFolderTreeButton.clicked.connect(self.buildProjectFolderTree)
             self.projectManagerSettingsLayout.addWidget(self.buildProjectFolderTreeButton)
 
+        if(self.__manager.mode == "kitsu"):
+            self.clearSnapshotsButton = QPushButton("Clear projects snapshots")
+            self.clearSnapshotsButton.setToolTip("Projects will be fully downloaded on next login.")
+            self.clearSnapshotsButton.clicked.connect(self.clearSnapshots)
+            self.projectManagerSettingsLayout.addWidget(self.clearSnapshotsButton)
+
+            self.clearThumbnailCacheButton = QPushButton("Clear previews cache")
+            self.clearThumbnailCacheButton.setToolTip("Previews will be downloaded again.")
+            self.clearThumbnailCacheButton.clicked.connect(self.clearThumbnailCache)
+            self.projectManagerSettingsLayout.addWidget(self.clearThumbnailCacheButton)
+
         self.projectManagerSettingsWidget.setLayout(self.projectManagerSettingsLayout)
         self.tabWidget.addTab(self.projectManagerSettingsWidget, "Project Manager Settings")
 
@@ -105,8 +116,25 @@ class PreferencesWindow(QWidget):
         """Build project foldertree.
         """
         self.__manager.logging.info("Folder tree generation started.")
-        self.__manager.projects[self.__manager.currentProject].buildFolderTree()
-        self.__manager.logging.info("Folder tree successfully generated.")
+        report = self.__manager.projects[self.__manager.currentProject].buildFolderTree(maxWorkers=int(self.__manager.preferences.getValue("MANAGER", "fetchWorkers")))
+
+        for folder in report["created"]:
+            self.__manager.logging.debug("%s created." % folder)
+
+        for folder, error in report["errors"].items():
+            self.__manager.logging.error("%s can't be created (%s)." % (folder, error))
+
+        self.__manager.logging.info("Folder tree generated: %i folders created, %i already existing, %i errors in %.2fs." % (len(report["created"]), report["existing"], len(report["errors"]), report["duration"]))
+    
+    def clearSnapshots(self):
+        """Remove projects snapshots to force a full download on next login.
+        """
+        self.__manager.link.clearSnapshots()
+    
+    def clearThumbnailCache(self):
+        """Remove cached previews.
+        """
+        self.__manager.link.clearThumbnailCache()
     
     def savePreferences(self):
         """Save preferences.
@@ -43,9 +43,13 @@ class PublishWindow(QWidget):
         self.__mainWindow   = mainWindow
         
         self.__currentProject = self.__manager.projects[self.__manager.currentProject]
-        self.__category     = self.__currentProject.categories[self.__currentProject.currentCategory]
         self.__entity       = entity
 
+        # Use the category owning the entity, the current one is only a fallback.
+        self.__category     = self.__currentProject.getEntityCategory(entity.id)
+        if(self.__category == None):
+            self.__category = self.__currentProject.categories[self.__currentProject.currentCategory]
+
         self.__screenshotPath = ""
         self.__screenshotSupport = self.__manager.integration.supportScreenshots
         
@@ -316,17 +320,12 @@ class PublishWindow(QWidget):
             )
             self.__manager.logging.info("Publishing done.")
 
-            # TODO: Find a way to refresh project.
-            # Refreshing the project to get last datas uploaded.
+            # Refreshing the published entity to get last datas uploaded.
+            self.__manager.refreshEntity(self.__entity)
+            self.__mainWindow.refreshEntity(self.__entity)
 
             self.__mainWindow.show()
-
-            # Temporary warning message.
-            # Show information message.
-            QMessageBox.warning(self, self.tr("Hestia"),
-                                self.tr("Please close Hestia to get latest updates."),
-                                QMessageBox.NoButton,
-                                QMessageBox.Ok)
+            self.__mainWindow.updateLog(text="%s published." % self.__entity.name)
 
         else:
             # Show information message.
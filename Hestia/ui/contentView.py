@@ -5,7 +5,7 @@
     :version:   0.0.4
     :brief:     Class to create the content view of the window.  
 """
-import os
+import os, threading
 
 try:
     from PySide2.QtCore     import *
@@ -17,8 +17,8 @@ except:
 
 from ..core.category        import Category
 
-from .widgets.gridWidget    import GridWidget
-from .widgets.entityWidget  import EntityWidget
+from .widgets.entityModel   import EntityModel
+from .widgets.entityDelegate import EntityDelegate
 
 class ContentView(QWidget):
     """Content View class.
@@ -41,20 +41,43 @@ class ContentView(QWidget):
         if(len(self.__project.categories) > 0):
             self.__category = self.__project.categories[self.__project.currentCategory]
 
-        self.__entities = self.__category.entities
+        self.__entities = self.__category.entities if self.__category.loaded else []
+        self.__waitingEntities = False
+
+        self.__iconSize = 100
+
+        # Previews atlas of the current category: (key, QPixmap, rectangles).
+        self.__atlas = (None, None, {})
+        # Only one atlas is built at a time.
+        self.__atlasLock = threading.Lock()
+
+        # Index of the card edited with an EntityWidget (the card under the mouse).
+        self.__editedIndex = QPersistentModelIndex()
 
         self.xSize = xSize
 
+        # Resize events are merged, the grid is updated once the user stop resizing.
+        self.resizeTimer = QTimer(self)
+        self.resizeTimer.setSingleShot(True)
+        self.resizeTimer.setInterval(100)
+        self.resizeTimer.timeout.connect(self.updateGridSize)
+
+        # Previews are downloaded by batches while scrolling, the atlas is built once downloads stop.
+        self.atlasTimer = QTimer(self)
+        self.atlasTimer.setSingleShot(True)
+        self.atlasTimer.setInterval(2000)
+        self.atlasTimer.timeout.connect(self.buildAtlas)
+
         self.initUI()
     
     def resizeEvent(self, event):
-        """Resize the widget when window is resized by user.
+        """Resize the cards when window is resized by user.
 
         Args:
             event (class: "QtEvent"): Event.
         """
         QWidget.resizeEvent(self, event)
-        self.refresh()
+        self.resizeTimer.start()
     
     def initUI(self):
         """Generate the window.
@@ -63,22 +86,41 @@ class ContentView(QWidget):
         # Set the main layout component.
         self.mainLayout = QHBoxLayout()
 
-        self.scrollArea = QScrollArea()
-        
-        # Updating the grid with a new grid.
-        self.grid = GridWidget(manager=self.__manager,
-                                parentGeometry=self.scrollArea.geometry(),
-                                xSize=self.xSize,
-                                itemList=self.buildEntityList(),
-                                emptyLabel="No items availables.")
-        
-        self.scrollArea.setWidget(self.grid)
+        # Only the visible cards are painted, widgets are never created for the whole category.
+        self.model = EntityModel(manager=self.__manager, iconSize=self.__iconSize, parent=self)
+        self.model.previewsLoaded.connect(self.atlasTimer.start)
+
+        self.delegate = EntityDelegate(manager=self.__manager,
+                                        mainWindow=self.__mainWindow,
+                                        iconSize=self.__iconSize,
+                                        parent=self)
+
+        self.listView = QListView()
+        self.listView.setViewMode(QListView.IconMode)
+        self.listView.setMovement(QListView.Static)
+        self.listView.setResizeMode(QListView.Adjust)
+        self.listView.setUniformItemSizes(True)
+        self.listView.setSelectionMode(QAbstractItemView.NoSelection)
+        self.listView.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.listView.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.listView.setMouseTracking(True)
+        self.listView.setModel(self.model)
+        self.listView.setItemDelegate(self.delegate)
 
-        self.mainLayout.addWidget(self.scrollArea)
+        self.listView.entered.connect(self.editEntity)
+        self.listView.verticalScrollBar().valueChanged.connect(self.prioritizeVisiblePreviews)
+
+        self.mainLayout.addWidget(self.listView)
+
+        self.emptyLabel = QLabel("No items availables.")
+        self.emptyLabel.setAlignment(Qt.AlignCenter)
+        self.mainLayout.addWidget(self.emptyLabel)
 
         # Set main layout to the window.
         self.setLayout(self.mainLayout)
 
+        self.updateEntities()
+
     def refresh(self):
         """Force refresh of the widget.
         """
@@ -89,34 +131,140 @@ class ContentView(QWidget):
         if(len(self.__project.categories) > 0):
             self.__category = self.__project.categories[self.__project.currentCategory]
 
-        self.__entities = self.__category.entities
+        # Entities loaded in background are displayed once their project and category are loaded,
+        # a project or a category is never loaded from the UI thread.
+        self.__waitingEntities = (not self.__project.loaded or not self.__category.loaded) and self.__mainWindow.loading
+        self.__entities = self.__category.entities if self.__category.loaded else []
 
-        # Updating the grid with a new grid.
-        self.grid = GridWidget(manager=self.__manager,
-                                parentGeometry=self.scrollArea.geometry(),
-                                xSize=self.xSize,
-                                itemList=self.buildEntityList(),
-                                emptyLabel="No items availables.")
+        # Previews of the old cards aren't needed anymore.
+        self.__manager.previewLoader.clear()
 
-        self.scrollArea.setWidget(self.grid)
+        self.updateEntities()
 
         self.update()
     
-    def buildEntityList(self):
-        """Build the entity array.
+    @property
+    def waitingEntities(self):
+        """Get the loading status of the displayed category.
+
+        Returns:
+            bool: Are the entities loaded in background.
+        """
+        return self.__waitingEntities
+
+    def updateEntities(self):
+        """Display the entities of the current category.
+        """
+        self.closeEditor()
+
+        atlasPixmap, atlasRects = self.getAtlas()
+        self.model.setEntities(self.__entities, atlasPixmap, atlasRects)
+
+        if(self.__waitingEntities):
+            self.emptyLabel.setText("Loading entities...")
+        elif(not self.__category.loaded):
+            self.emptyLabel.setText("Entities can't be loaded, select the category again to retry.")
+        else:
+            self.emptyLabel.setText("No items availables.")
+        self.listView.setVisible(len(self.__entities) > 0)
+        self.emptyLabel.setVisible(len(self.__entities) == 0)
+
+        self.updateGridSize()
+    
+    def updateGridSize(self):
+        """Fit the cards in the width of the view, cards are only moved by the view.
+        """
+        width = self.listView.viewport().width() / max(1, self.xSize)
+        self.delegate.cardWidth = width
+        self.listView.setGridSize(QSize(self.delegate.cardWidth, self.delegate.cardHeight))
+    
+    def getAtlas(self):
+        """Get the previews atlas of the current category.
+
+        Returns:
+            tuple: (class: `QPixmap`, dict): Atlas and rectangles by entity ID, (None, {}) if not available.
+        """
+        if(self.__manager.mode != "kitsu"):
+            return None, {}
+
+        key = (self.__project.id, self.__category.id)
+        if(self.__atlas[0] != key):
+            atlasPath, atlasRects = self.__manager.link.getCategoryAtlas(self.__category, self.__iconSize)
+            atlasPixmap = QPixmap(atlasPath) if atlasPath != None else None
+            if(atlasPixmap == None or atlasPixmap.isNull()):
+                atlasRects = {}
+            self.__atlas = (key, atlasPixmap, atlasRects)
+
+        return self.__atlas[1], self.__atlas[2]
+    
+    def buildAtlas(self):
+        """Build the category atlas in background once every requested preview is downloaded.
+        """
+        if(self.__manager.mode != "kitsu"):
+            return
+
+        if(not self.__atlasLock.acquire(False)):
+            # An atlas is already being built, try again after it.
+            self.atlasTimer.start()
+            return
+
+        category = self.__category
+        def buildAtlas():
+            try:
+                self.__manager.link.buildCategoryAtlas(category, self.__iconSize)
+            except Exception as error:
+                self.__manager.logging.error("%s : Previews atlas can't be built (%s)." % (category.name, error))
+            finally:
+                self.__atlasLock.release()
+
+        thread = threading.Thread(target=buildAtlas)
+        thread.daemon = True
+        thread.start()
+    
+    def prioritizeVisiblePreviews(self):
+        """Download the previews of the visible entities before the other ones.
+        Previews are requested while painting, so the visible cards are requested again ahead of the other ones.
+        """
+        self.model.nextPreviewsPass()
+        self.listView.viewport().update()
+    
+    def editEntity(self, index):
+        """Display an EntityWidget over the card under the mouse.
+
+        Args:
+            index (class: "QModelIndex"): Index of the card.
+        """
+        if(self.__editedIndex == index):
+            return
+
+        self.closeEditor()
+
+        self.__editedIndex = QPersistentModelIndex(index)
+        self.listView.openPersistentEditor(index)
+    
+    def closeEditor(self):
+        """Remove the EntityWidget of the edited card.
+        """
+        if(self.__editedIndex.isValid()):
+            self.listView.closePersistentEditor(self.model.index(self.__editedIndex.row()))
+
+        self.__editedIndex = QPersistentModelIndex()
+    
+    def refreshEntity(self, entity):
+        """Refresh the card of a single entity.
+
+        Args:
+            entity (class:"Entity"): Entity updated.
 
         Returns:
-            list (class:"EntityWidget"): Array of EntityWidget.
+            bool: Is the entity displayed.
         """
-        entityList = []
-
-        for entity in range(len(self.__entities)):
-            newEntity = EntityWidget(manager=self.__manager,
-                                    mainWindow=self.__mainWindow,
-                                    asset=self.__entities[entity],
-                                    iconSize=100,
-                                    status=1)
-            
-            entityList.append(newEntity)
-
-        return entityList
\ No newline at end of file
+        index = self.model.index(self.__editedIndex.row()) if self.__editedIndex.isValid() else QModelIndex()
+        if(index.isValid() and index.data(EntityModel.entityRole) == entity):
+            # Recreate the widget with the new versions.
+            self.closeEditor()
+            self.model.refreshEntity(entity)
+            self.editEntity(index)
+            return True
+
+        return self.model.refreshEntity(entity)
\ No newline at end of file
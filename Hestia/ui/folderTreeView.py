@@ -34,6 +34,12 @@ class FolderTreeView(QWidget):
 
         self.__availableTypes = ["Assets", "Shots"]
         self.__categories = [category for category in self.__project.categories if category.type == self.__availableTypes[0]]
+
+        # Resize events are merged, the grid is updated once the user stop resizing.
+        self.resizeTimer = QTimer(self)
+        self.resizeTimer.setSingleShot(True)
+        self.resizeTimer.setInterval(100)
+        self.resizeTimer.timeout.connect(self.reflow)
         
         self.initUI()
     
@@ -44,7 +50,12 @@ class FolderTreeView(QWidget):
             event (class: "QtEvent"): Event.
         """
         QWidget.resizeEvent(self, event)
-        self.refresh()
+        self.resizeTimer.start()
+    
+    def reflow(self):
+        """Fit the existing categories in the new size of the widget.
+        """
+        self.grid.reflow(self.scrollArea.geometry())
     
     def initUI(self):
         """Generate the window.
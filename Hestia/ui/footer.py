@@ -43,6 +43,11 @@ class Footer(QWidget):
         # Add spacer to footer.
         self.mainLayout.addStretch()
 
+        # Add projects loading progress.
+        self.progressBar = QProgressBar()
+        self.progressBar.hide()
+        self.mainLayout.addWidget(self.progressBar)
+
         # Add current logged in user.
         self.currentVersion = QLabel("V %s" % self.version)
         self.mainLayout.addWidget(self.currentVersion)
@@ -58,6 +63,24 @@ class Footer(QWidget):
         """
         self.logWidget.setText(text)
 
+    def updateProgress(self, step, count, total):
+        """Display the progress of the projects loading.
+
+        Args:
+            step (str): Step name.
+            count (int): Number of items loaded.
+            total (int): Number of items to load.
+        """
+        self.progressBar.setMaximum(max(1, total))
+        self.progressBar.setValue(count)
+        self.progressBar.setFormat("Loading %s : %i/%i" % (step, count, total))
+        self.progressBar.show()
+
+    def hideProgress(self):
+        """Hide the projects loading progress.
+        """
+        self.progressBar.hide()
+
     def refresh(self):
         """Force refresh of the widget.
         """
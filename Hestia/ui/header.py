@@ -93,6 +93,12 @@ class Header(QWidget):
         """Change the project on the manager and update the mainWindow.
         """
         self.__manager.currentProject = self.projectSelector.currentValue
+
+        # A project not loaded yet is loaded in background, the window is refreshed once loaded.
+        project = self.__manager.projects[self.__manager.currentProject]
+        if(not project.loaded):
+            self.__mainWindow.loadProject(project)
+
         self.__mainWindow.refreshProject()
 
     def refresh(self):
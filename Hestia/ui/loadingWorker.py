@@ -0,0 +1,169 @@
+"""
+    :package:   Hestia
+    :file:      loadingWorker.py
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+    :brief:     Class to load the online projects outside of the UI thread.
+"""
+import threading
+
+try:
+    from PySide2.QtCore     import *
+    from PySide2.QtGui      import *
+    from PySide2.QtWidgets  import *
+except:
+    from PySide.QtCore      import *
+    from PySide.QtGui       import *
+
+class LoadingWorker(QObject):
+    """Loading worker class, login and load projects in a background thread.
+    With a project, only the tasks and categories of this project are loaded.
+    With a category, only the entities of this category are loaded.
+
+    Signals are emitted from the background thread, Qt delivers them in the UI thread.
+
+    Args:
+        manager (class: "Manager"): The Hestia manager.
+        api (str): Api to connect.
+        username (str): Username.
+        password (str): Password.
+        project (class: "Project", optional): Project to load instead of login. Defaults to None.
+        category (class: "Category", optional): Category to load instead of login. Defaults to None.
+        parent (class: "QObject", optional): Parent object. Defaults to None.
+    """
+    # Step name, number of items loaded and total.
+    progress        = Signal(str, int, int)
+    # Projects built by the worker and index of the current one, added to the manager by the UI thread.
+    projectsLoaded  = Signal(object, int)
+    # Login status, the current project can be browsed once emitted.
+    connected       = Signal(bool)
+    # ID of a project with its tasks and categories loaded (or failed to).
+    projectLoaded   = Signal(str)
+    # ID of a category with its entities loaded.
+    categoryLoaded  = Signal(str)
+    # Emitted at the end of the loading, even if cancelled.
+    finished        = Signal()
+
+    def __init__(self, manager, api="", username="", password="", project=None, category=None, parent=None):
+        super(LoadingWorker, self).__init__(parent)
+        self.__manager  = manager
+        self.__api      = api
+        self.__username = username
+        self.__password = password
+        self.__project  = project
+        self.__category = category
+
+        # Projects built by this worker.
+        self.__projects = []
+        self.__currentProject = 0
+
+        self.__running  = False
+
+    @property
+    def running(self):
+        """Get the status of the worker.
+
+        Returns:
+            bool: Is the loading running.
+        """
+        return self.__running
+
+    def start(self):
+        """Start the loading in a background thread.
+        """
+        self.__running = True
+
+        # Daemon thread, a cancelled request never blocks the host application on exit.
+        thread = threading.Thread(target=self.run)
+        thread.daemon = True
+        thread.start()
+
+    def cancel(self):
+        """Stop the loading after the current request.
+        """
+        self.__manager.cancelLoading()
+
+    def run(self):
+        """Login, load the first project then the entities of its categories.
+        """
+        if(self.__project != None):
+            self.runProject()
+            return
+
+        if(self.__category != None):
+            self.runCategory()
+            return
+
+        try:
+            try:
+                status = self.__manager.connectToOnline(api=self.__api,
+                                                        username=self.__username,
+                                                        password=self.__password,
+                                                        progressCallback=self.progress.emit,
+                                                        projectsCallback=self.sendProjects)
+            except Exception as error:
+                self.__manager.logging.error("Login failed (%s)." % error)
+                status = False
+
+            self.connected.emit(status)
+
+            if(not status or self.__manager.loadingCancelled):
+                return
+
+            if(len(self.__projects) == 0):
+                return
+
+            # Categories are browsable as soon as their entities are loaded.
+            project = self.__projects[self.__currentProject]
+            self.__manager.loadCategories(project, callback=self.sendCategoryLoaded)
+        finally:
+            self.__running = False
+            self.finished.emit()
+
+    def sendProjects(self, projects, currentProject):
+        """Send the projects built by the manager to the UI thread.
+
+        Args:
+            projects (list(class: "Project")): Projects.
+            currentProject (int): Index of the current project.
+        """
+        self.__projects = projects
+        self.__currentProject = currentProject
+        self.projectsLoaded.emit(projects, currentProject)
+
+    def runProject(self):
+        """Load the tasks and categories of a single project.
+        """
+        try:
+            try:
+                self.__project.load()
+            except Exception as error:
+                self.__manager.logging.error("%s : Failed to load project (%s)." % (self.__project.name, error))
+        finally:
+            self.__running = False
+            self.projectLoaded.emit(self.__project.id)
+            self.finished.emit()
+
+    def runCategory(self):
+        """Load the entities of a single category.
+        """
+        try:
+            try:
+                self.__category.load()
+            except Exception as error:
+                self.__manager.logging.error("%s : Failed to load category (%s)." % (self.__category.name, error))
+        finally:
+            self.__running = False
+            self.categoryLoaded.emit(self.__category.id)
+            self.finished.emit()
+
+    def sendCategoryLoaded(self, category, count, total):
+        """Send the loading progress of the categories entities.
+
+        Args:
+            category (class: "Category"): Category loaded.
+            count (int): Number of categories loaded.
+            total (int): Number of categories to load.
+        """
+        self.progress.emit("entities", count, total)
+        self.categoryLoaded.emit(category.id)
@@ -64,5 +64,9 @@ class CategoryWidget(QWidget):
         """Change the current category of the project.
         """
         self.__manager.projects[self.__manager.currentProject].currentCategory = self.__categoryID
+
+        # Load entities of the category in background if the project is lazy loaded.
+        if(not self.__category.loaded):
+            self.__mainWindow.loadCategory(self.__category)
         self.__parent.refresh()
         self.__mainWindow.refreshCategory()
\ No newline at end of file
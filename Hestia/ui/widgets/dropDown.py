@@ -44,7 +44,17 @@ class DropDown(QWidget):
             int: Index.
         """
         return self.__currentValue
-    
+
+    @currentValue.setter
+    def currentValue(self, newValue):
+        """Set the selected value in dropdown.
+
+        Args:
+            newValue (int): Index.
+        """
+        if(newValue >= 0 and newValue < len(self.__datas)):
+            self.dropDown.setCurrentIndex(newValue)
+
     @property
     def datas(self):
         """Returnt the datas stored in the dropdown.
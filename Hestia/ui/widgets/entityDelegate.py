@@ -0,0 +1,177 @@
+"""
+    :package:   Hestia
+    :file:      entityDelegate.py
+    :brief:     Item delegate of the entities grid.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+try:
+    from PySide2.QtCore     import *
+    from PySide2.QtGui      import *
+    from PySide2.QtWidgets  import *
+except:
+    from PySide.QtCore      import *
+    from PySide.QtGui       import *
+
+from .entityModel           import EntityModel
+from .entityWidget          import EntityWidget
+
+class EntityDelegate(QStyledItemDelegate):
+    """Entity delegate class, paint the entity cards without creating widgets.
+
+    The card under the mouse is edited with an EntityWidget to keep the import,
+    the version selection and the right click menu.
+
+    Args:
+        manager (class: `Manager`): The Hestia manager.
+        mainWindow (class: `MainWindow`): The Hestia main window.
+        iconSize (int, optional): Size of the icons to display. Defaults to 100.
+        parent (class: `QObject`, optional): Parent object. Defaults to None.
+    """
+    def __init__(self, manager, mainWindow, iconSize=100, parent=None):
+        super(EntityDelegate, self).__init__(parent)
+        self.__manager      = manager
+        self.__mainWindow   = mainWindow
+        self.__iconSize     = iconSize
+
+        self.__cardWidth    = iconSize * 2
+        # Card margins and height of the title and version lines.
+        self.__margin       = 9
+        self.__lineHeight   = 24
+
+    @property
+    def cardWidth(self):
+        """Get the width of the cards.
+
+        Returns:
+            int: Width in pixels.
+        """
+        return self.__cardWidth
+
+    @cardWidth.setter
+    def cardWidth(self, width):
+        """Set the width of the cards.
+
+        Args:
+            width (int): Width in pixels.
+        """
+        self.__cardWidth = max(self.__iconSize + 2 * self.__margin, int(width))
+
+    @property
+    def cardHeight(self):
+        """Get the height of the cards.
+
+        Returns:
+            int: Height in pixels.
+        """
+        return self.__iconSize + 2 * self.__lineHeight + 4 * self.__margin
+
+    def sizeHint(self, option, index):
+        """Get the size of a card.
+
+        Args:
+            option (class: `QStyleOptionViewItem`): Style options.
+            index (class: `QModelIndex`): Index.
+
+        Returns:
+            class: `QSize`: Card size.
+        """
+        return QSize(self.__cardWidth, self.cardHeight)
+
+    def paint(self, painter, option, index):
+        """Paint a card.
+
+        Args:
+            painter (class: `QPainter`): Painter.
+            option (class: `QStyleOptionViewItem`): Style options.
+            index (class: `QModelIndex`): Index.
+        """
+        painter.save()
+
+        style = QApplication.style()
+        cardRect = option.rect.adjusted(self.__margin, self.__margin, -self.__margin, -self.__margin)
+
+        # Frame.
+        frameOption = QStyleOptionFrame()
+        frameOption.rect = cardRect.adjusted(0, int(self.__lineHeight / 2), 0, 0)
+        frameOption.palette = option.palette
+        style.drawPrimitive(QStyle.PE_FrameGroupBox, frameOption, painter)
+
+        # Title.
+        titleRect = QRect(cardRect.left() + self.__margin, cardRect.top(),
+                            cardRect.width() - 2 * self.__margin, self.__lineHeight)
+        title = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, titleRect.width())
+        painter.fillRect(option.fontMetrics.boundingRect(titleRect, Qt.AlignLeft | Qt.AlignVCenter, title),
+                            option.palette.window())
+        painter.setPen(option.palette.color(QPalette.WindowText))
+        painter.drawText(titleRect, Qt.AlignLeft | Qt.AlignVCenter, title)
+
+        # Icon.
+        iconRect = QRect(cardRect.center().x() - int(self.__iconSize / 2), titleRect.bottom() + self.__margin,
+                            self.__iconSize, self.__iconSize)
+        iconMode = QIcon.Normal if index.data(EntityModel.statusRole) else QIcon.Disabled
+        index.data(Qt.DecorationRole).paint(painter, iconRect, Qt.AlignCenter, iconMode)
+
+        # Version.
+        versionRect = QRect(titleRect.left(), iconRect.bottom() + self.__margin,
+                            titleRect.width(), self.__lineHeight)
+        version = option.fontMetrics.elidedText("Version : %s" % index.data(EntityModel.versionNameRole),
+                                                Qt.ElideRight, versionRect.width())
+        painter.drawText(versionRect, Qt.AlignLeft | Qt.AlignVCenter, version)
+
+        painter.restore()
+
+    def createEditor(self, parent, option, index):
+        """Create the widget of the card under the mouse.
+
+        Args:
+            parent (class: `QWidget`): Parent widget.
+            option (class: `QStyleOptionViewItem`): Style options.
+            index (class: `QModelIndex`): Index.
+
+        Returns:
+            class: `EntityWidget`: Entity widget.
+        """
+        # Reuse the painted preview, nothing is downloaded twice.
+        atlasIcon = index.data(Qt.DecorationRole) if index.data(EntityModel.previewRole) else None
+
+        editor = EntityWidget(manager=self.__manager,
+                                mainWindow=self.__mainWindow,
+                                asset=index.data(EntityModel.entityRole),
+                                iconSize=self.__iconSize,
+                                status=1,
+                                atlasIcon=atlasIcon,
+                                parent=parent)
+        editor.setAutoFillBackground(True)
+        editor.versionChanged.connect(lambda: self.commitData.emit(editor))
+
+        return editor
+
+    def setEditorData(self, editor, index):
+        """Select the version of the card in the widget.
+
+        Args:
+            editor (class: `EntityWidget`): Entity widget.
+            index (class: `QModelIndex`): Index.
+        """
+        editor.currentVersionIndex = index.data(EntityModel.versionRole)
+
+    def setModelData(self, editor, model, index):
+        """Store the version selected in the widget.
+
+        Args:
+            editor (class: `EntityWidget`): Entity widget.
+            model (class: `EntityModel`): Entity model.
+            index (class: `QModelIndex`): Index.
+        """
+        model.setData(index, editor.currentVersionIndex, EntityModel.versionRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        """Place the widget over its card.
+
+        Args:
+            editor (class: `EntityWidget`): Entity widget.
+            option (class: `QStyleOptionViewItem`): Style options.
+            index (class: `QModelIndex`): Index.
+        """
+        editor.setGeometry(option.rect)
@@ -0,0 +1,285 @@
+"""
+    :package:   Hestia
+    :file:      entityModel.py
+    :brief:     Item model of the entities grid.
+    :author:    PiloeGAO (Leo DEPOIX)
+    :version:   0.0.4
+"""
+from os import path
+
+global pysideVers
+try:
+    from PySide2.QtCore     import *
+    from PySide2.QtGui      import *
+    from PySide2.QtWidgets  import *
+    pysideVers = 2
+except:
+    from PySide.QtCore      import *
+    from PySide.QtGui       import *
+    pysideVers = 1
+
+class EntityModel(QAbstractListModel):
+    """Entity model class, previews are requested only when a card is painted.
+
+    Args:
+        manager (class: `Manager`): The Hestia manager.
+        iconSize (int, optional): Size of the icons to display. Defaults to 100.
+        parent (class: `QObject`, optional): Parent object. Defaults to None.
+    """
+    entityRole      = Qt.UserRole
+    versionRole     = Qt.UserRole + 1
+    versionNameRole = Qt.UserRole + 2
+    statusRole      = Qt.UserRole + 3
+    previewRole     = Qt.UserRole + 4
+
+    # Emitted from the preview loader workers.
+    previewLoaded   = Signal(str)
+    # Emitted once every requested preview is downloaded.
+    previewsLoaded  = Signal()
+
+    def __init__(self, manager, iconSize=100, parent=None):
+        super(EntityModel, self).__init__(parent)
+        self.__manager      = manager
+        self.__iconSize     = iconSize
+
+        self.__rootPath = path.dirname(path.abspath(__file__))
+
+        if(pysideVers == 2):
+            self.__defaultIcon = QIcon(self.__rootPath + "/../icons/card-image.svg")
+        else:
+            self.__defaultIcon = QIcon(self.__rootPath + "/../icons/card-image.png")
+
+        self.__entities     = []
+        self.__rows         = {}
+        self.__versions     = {}
+
+        # Previews of the category atlas and loaded icons by entity ID.
+        self.__atlas        = None
+        self.__atlasRects   = {}
+        self.__icons        = {}
+
+        # Visible previews are downloaded first, each pass is ahead of the previous ones.
+        self.__previewsPass = 0
+        self.__requestedPreviews = set()
+
+        self.previewLoaded.connect(self.updatePreview)
+
+    @property
+    def entities(self):
+        """Get the entities of the model.
+
+        Returns:
+            list: class:`Entity`: Entities.
+        """
+        return self.__entities
+
+    @property
+    def iconSize(self):
+        """Get the size of the icons.
+
+        Returns:
+            int: Size in pixels.
+        """
+        return self.__iconSize
+
+    def setEntities(self, entities, atlas=None, atlasRects={}):
+        """Replace the entities of the model.
+
+        Args:
+            entities (list: class:`Entity`): Entities.
+            atlas (class: `QPixmap`, optional): Previews atlas of the entities. Defaults to None.
+            atlasRects (dict, optional): Rectangles of the previews in the atlas by entity ID. Defaults to {}.
+        """
+        self.beginResetModel()
+
+        self.__entities     = list(entities)
+        self.__rows         = dict([(entity.id, row) for row, entity in enumerate(self.__entities)])
+        self.__versions     = {}
+        self.__atlas        = atlas
+        self.__atlasRects   = atlasRects if atlas != None else {}
+        self.__icons        = {}
+        self.__requestedPreviews = set()
+
+        self.endResetModel()
+
+    def nextPreviewsPass(self):
+        """Start a new priority pass, previews painted after this call are downloaded first.
+        """
+        self.__previewsPass += 1
+
+    def rowCount(self, parent=QModelIndex()):
+        """Get the number of entities.
+
+        Args:
+            parent (class: `QModelIndex`, optional): Parent index. Defaults to QModelIndex().
+
+        Returns:
+            int: Number of rows.
+        """
+        if(parent.isValid()):
+            return 0
+
+        return len(self.__entities)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Get the data of an entity.
+
+        Args:
+            index (class: `QModelIndex`): Index.
+            role (int, optional): Data role. Defaults to Qt.DisplayRole.
+
+        Returns:
+            object: Data.
+        """
+        if(not index.isValid() or index.row() >= len(self.__entities)):
+            return None
+
+        entity = self.__entities[index.row()]
+
+        if(role == Qt.DisplayRole):
+            return entity.name
+        elif(role == Qt.ToolTipRole):
+            return entity.description
+        elif(role == Qt.DecorationRole):
+            return self.getIcon(entity)
+        elif(role == self.entityRole):
+            return entity
+        elif(role == self.versionRole):
+            return self.__versions.get(entity.id, 0)
+        elif(role == self.versionNameRole):
+            version = self.getCurrentVersion(entity)
+            if(version == None):
+                return "No versions available."
+            return "%s (%s)" % (version.name, version.type)
+        elif(role == self.statusRole):
+            version = self.getCurrentVersion(entity)
+            return version != None and version.type in self.__manager.integration.availableFormats
+        elif(role == self.previewRole):
+            return entity.id in self.__icons
+
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """Set the selected version of an entity.
+
+        Args:
+            index (class: `QModelIndex`): Index.
+            value (int): Version index.
+            role (int, optional): Data role, only versionRole is supported. Defaults to Qt.EditRole.
+
+        Returns:
+            bool: Status.
+        """
+        if(not index.isValid() or role != self.versionRole):
+            return False
+
+        entity = self.__entities[index.row()]
+        if(self.__versions.get(entity.id, 0) != value):
+            self.__versions[entity.id] = value
+            self.dataChanged.emit(index, index)
+
+        return True
+
+    def flags(self, index):
+        """Get the flags of an index, cards are editable to show their version selector.
+
+        Args:
+            index (class: `QModelIndex`): Index.
+
+        Returns:
+            int: Flags.
+        """
+        if(not index.isValid()):
+            return Qt.NoItemFlags
+
+        return Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def getCurrentVersion(self, entity):
+        """Get the selected version of an entity.
+
+        Args:
+            entity (class:`Entity`): Entity.
+
+        Returns:
+            class:`Version`: Version, None if the entity doesn't have versions.
+        """
+        versionIndex = self.__versions.get(entity.id, 0)
+        if(versionIndex >= len(entity.versions)):
+            return None
+
+        return entity.versions[versionIndex]
+
+    def getIcon(self, entity):
+        """Get the icon of an entity, the preview is requested if not available.
+
+        Args:
+            entity (class:`Entity`): Entity.
+
+        Returns:
+            class: `QIcon`: Icon.
+        """
+        icon = self.__icons.get(entity.id, None)
+        if(icon != None):
+            return icon
+
+        if(entity.id in self.__atlasRects):
+            icon = QIcon(self.__atlas.copy(*self.__atlasRects[entity.id]))
+        elif(entity.isIconLoaded(self.__iconSize)):
+            if(not path.exists(entity.getIcon(self.__iconSize))):
+                return self.__defaultIcon
+            icon = QIcon(entity.getIcon(self.__iconSize))
+        else:
+            # Only painted cards get here, a new request move the preview ahead.
+            self.__requestedPreviews.add(entity.id)
+            self.__manager.previewLoader.request(entity,
+                                                callback=self.sendPreviewLoaded,
+                                                priority=-self.__previewsPass,
+                                                size=self.__iconSize)
+            return self.__defaultIcon
+
+        self.__icons[entity.id] = icon
+        return icon
+
+    def sendPreviewLoaded(self, entity):
+        """Send the preview loaded signal, called from the preview loader workers.
+
+        Args:
+            entity (class:`Entity`): Entity.
+        """
+        self.previewLoaded.emit(entity.id)
+
+    def updatePreview(self, entityId):
+        """Update the card of an entity once its preview is downloaded.
+
+        Args:
+            entityId (str): Entity ID.
+        """
+        if(entityId not in self.__requestedPreviews):
+            # Preview requested for old entities.
+            return
+
+        self.__requestedPreviews.discard(entityId)
+
+        index = self.index(self.__rows[entityId])
+        self.dataChanged.emit(index, index)
+
+        if(len(self.__requestedPreviews) == 0):
+            self.previewsLoaded.emit()
+
+    def refreshEntity(self, entity):
+        """Update the card of an entity after a change of its versions.
+
+        Args:
+            entity (class:`Entity`): Entity.
+
+        Returns:
+            bool: Is the entity in the model.
+        """
+        if(entity.id not in self.__rows):
+            return False
+
+        self.__versions.pop(entity.id, None)
+
+        index = self.index(self.__rows[entity.id])
+        self.dataChanged.emit(index, index)
+        return True
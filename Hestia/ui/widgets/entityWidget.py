@@ -32,9 +32,15 @@ class EntityWidget(QWidget):
             asset (class: `Entity`): The entity to display.
             iconSize (int, optional): Size of the icon to display. Defaults to 64.
             status (int, optional): Status of the button. Defaults to 1.
+            atlasIcon (class: `QIcon`, optional): Preview from the category atlas, nothing is downloaded. Defaults to None.
             parent (class: `QWidget`, optional): Parent widget. Defaults to None.
     """
-    def __init__(self, manager=None, mainWindow=None, asset=None, iconSize=64, status=1, parent=None):
+    # Emitted from the preview loader workers.
+    previewLoaded = Signal()
+    # Emitted when the user select another version.
+    versionChanged = Signal()
+
+    def __init__(self, manager=None, mainWindow=None, asset=None, iconSize=64, status=1, atlasIcon=None, parent=None):
         super(EntityWidget, self).__init__(parent=parent)
         self.__manager      = manager
         self.__mainWindow   = mainWindow
@@ -50,8 +56,11 @@ class EntityWidget(QWidget):
 
         self.__name           = asset.name
         self.__description    = asset.description
-        self.__icon           = asset.icon if path.exists(asset.icon) else self.__defaultIcon
+        # The preview is downloaded in background, the default icon is used until it's available.
         self.__iconSize       = iconSize
+        self.__icon           = self.__defaultIcon
+        if(asset.isIconLoaded(self.__iconSize) and path.exists(asset.getIcon(self.__iconSize))):
+            self.__icon = asset.getIcon(self.__iconSize)
         self.__versions       = asset.versions
         self.__currentVersion = self.__versions[0] if len(self.__versions) > 0 else None
 
@@ -61,7 +70,40 @@ class EntityWidget(QWidget):
             self.__status = 0
 
         self.initUI()
+
+        if(atlasIcon != None):
+            self.iconButton.setIconImage(atlasIcon)
+        elif(not asset.isIconLoaded(self.__iconSize)):
+            self.previewLoaded.connect(self.updateIcon)
+            self.__manager.previewLoader.request(asset, callback=lambda entity: self.previewLoaded.emit(), size=self.__iconSize)
     
+    @property
+    def asset(self):
+        """Get the entity displayed.
+
+        Returns:
+            class: `Entity`: Entity.
+        """
+        return self.__asset
+    
+    @property
+    def currentVersionIndex(self):
+        """Get the index of the selected version.
+
+        Returns:
+            int: Version index.
+        """
+        return self.versionDropDown.currentValue
+
+    @currentVersionIndex.setter
+    def currentVersionIndex(self, versionIndex):
+        """Set the selected version.
+
+        Args:
+            versionIndex (int): Version index.
+        """
+        self.versionDropDown.currentValue = versionIndex
+
     def initUI(self):
         """Main UI creation function.
         """
@@ -92,6 +134,13 @@ class EntityWidget(QWidget):
         self.mainLayout.addWidget(self.groupBox)
         self.setLayout(self.mainLayout)
 
+    def updateIcon(self):
+        """Display the entity preview once downloaded.
+        """
+        if(path.exists(self.__asset.getIcon(self.__iconSize))):
+            self.__icon = self.__asset.getIcon(self.__iconSize)
+            self.iconButton.setIcon(self.__icon)
+    
     def mousePressEvent(self, event):
         if event.type() == QEvent.MouseButtonPress:
             if event.button() == Qt.RightButton:
@@ -138,6 +187,23 @@ class EntityWidget(QWidget):
 
             self.__status = 0 if not self.__currentVersion.type in self.__manager.integration.availableFormats else 1
             self.iconButton.changeButtonStatus(self.__status)
+
+            self.versionChanged.emit()
+
+    def refresh(self):
+        """Update the versions of the widget from the entity.
+        """
+        self.__versions       = self.__asset.versions
+        self.__currentVersion = self.__versions[0] if len(self.__versions) > 0 else None
+
+        self.versionDropDown.datas = self.getVersionsNames()
+
+        if(len(self.__versions) > 0):
+            self.updateEntity()
+        else:
+            self.iconButton.changeButtonStatus(0)
+
+        self.update()
     
     def createRightClickMenu(self, event):
         """This function invoke a floating menu at mouse position with advanced functionnalities.
@@ -200,10 +266,15 @@ class EntityWidget(QWidget):
                                                             shot=self.__asset)
 
         # Import assigned assets.
-        assets = [entity for entity in currentProject.entities if entity.type == "Assets"]
+        # Assets categories need to be loaded to find assets from their IDs.
+        currentProject.getEntitiesByType("Assets")
+
         for assetID in self.__asset.assignedAssets:
             # Get the asset from ID.
-            assetToImport = [asset for asset in assets if asset.id == assetID][0]
+            assetToImport = currentProject.getEntity(assetID)
+            if(assetToImport == None):
+                self.__manager.logging.error("Asset %s not found in the project." % assetID)
+                continue
             
             # Get the last updated version of the asset.
             # TODO: Filter the versions, publish branch need to be merged before to support Version Number.
@@ -224,7 +295,7 @@ class EntityWidget(QWidget):
                 self.__manager.integration.loadAsset(asset = assetToImport,
                                                     version = self.currentAssetVersion)
             else:
-                self.__manager.logging.error("Failed to load %s" % self.assetToImport.name)
+                self.__manager.logging.error("Failed to load %s" % assetToImport.name)
 
         if(setupStatus):
             return True
@@ -33,10 +33,13 @@ class GridWidget(QWidget):
         self.__itemListSize = len(itemList)
 
         self.__xSize = int(xSize)
-        self.__ySize = int(self.__itemListSize / self.__xSize + self.__itemListSize % self.__xSize)
+        self.__ySize = 0
 
         self.__emptyLabel = emptyLabel
 
+        # Labels used to fill the last row.
+        self.__fillers = []
+
         self.initUI()
     
     def initUI(self):
@@ -49,34 +52,74 @@ class GridWidget(QWidget):
             self.mainLayout.setSpacing(0)
             self.mainLayout.setContentsMargins(0, 0, 0, 0)
 
-            # Build the loop for QHBoxLayout creation.
-            for y in range(self.__ySize):
-                # Creating the horizontal layout for X.
-                horizontalLayout = QHBoxLayout()
-                horizontalLayout.setSpacing(0)
-                horizontalLayout.setSizeConstraint(QLayout.SetMaximumSize)
-                horizontalLayout.setContentsMargins(0, 0, 0, 0)
-
-                for x in range(self.__xSize):
-                    itemCount = x + y * self.__xSize
-
-                    if(itemCount < self.__itemListSize):
-                        # Create the widget.
-                        item = self.__itemList[itemCount]
-                                            
-                    else:
-                        # Add empty string if no item available to keep grid.
-                        item = QLabel("")
-                    
-                    item.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                    item.setMinimumWidth(self.__parentGeometry.width()/self.__xSize - 10)
-                    horizontalLayout.addWidget(item)
-                
-                self.mainLayout.addLayout(horizontalLayout)
+            self.layoutItems()
         
         else:
             self.textDisplay = QLabel(self.__emptyLabel)
             self.mainLayout.addWidget(self.textDisplay)
 
         # Set main layout to the window.
-        self.setLayout(self.mainLayout)
\ No newline at end of file
+        self.setLayout(self.mainLayout)
+    
+    def layoutItems(self):
+        """Place the items in rows of xSize items.
+        """
+        self.__ySize = int((self.__itemListSize + self.__xSize - 1) / self.__xSize)
+
+        # Build the loop for QHBoxLayout creation.
+        for y in range(self.__ySize):
+            # Creating the horizontal layout for X.
+            horizontalLayout = QHBoxLayout()
+            horizontalLayout.setSpacing(0)
+            horizontalLayout.setSizeConstraint(QLayout.SetMaximumSize)
+            horizontalLayout.setContentsMargins(0, 0, 0, 0)
+
+            for x in range(self.__xSize):
+                itemCount = x + y * self.__xSize
+
+                if(itemCount < self.__itemListSize):
+                    # Create the widget.
+                    item = self.__itemList[itemCount]
+                                        
+                else:
+                    # Add empty string if no item available to keep grid.
+                    item = QLabel("")
+                    self.__fillers.append(item)
+                
+                item.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                item.setMinimumWidth(int(self.__parentGeometry.width()/self.__xSize - 10))
+                horizontalLayout.addWidget(item)
+            
+            self.mainLayout.addLayout(horizontalLayout)
+    
+    def reflow(self, parentGeometry, xSize=None):
+        """Fit the existing items in a new size, items are moved but never created again.
+
+        Args:
+            parentGeometry (class: `QRect`): The parent widget size in pixels.
+            xSize (int, optional): New number of items on width, None to keep the current one. Defaults to None.
+        """
+        self.__parentGeometry = parentGeometry
+
+        if(self.__itemListSize == 0):
+            return
+
+        if(xSize == None or int(xSize) == self.__xSize):
+            for item in self.__itemList + self.__fillers:
+                item.setMinimumWidth(int(self.__parentGeometry.width()/self.__xSize - 10))
+            return
+
+        self.__xSize = max(1, int(xSize))
+
+        # Remove the rows, items stay parented to the grid.
+        while(self.mainLayout.count() > 0):
+            row = self.mainLayout.takeAt(0).layout()
+            while(row.count() > 0):
+                row.takeAt(0)
+            row.deleteLater()
+
+        for filler in self.__fillers:
+            filler.deleteLater()
+        self.__fillers = []
+
+        self.layoutItems()
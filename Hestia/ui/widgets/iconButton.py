@@ -93,6 +93,31 @@ class IconButton(QWidget):
         # Add the main layout to the window.
         self.setLayout(self.mainLayout)
     
+    def setIcon(self, iconPath):
+        """Change the icon of the button.
+
+        Args:
+            iconPath (str): Path to icon.
+        """
+        if(not os.path.isfile(iconPath)):
+            return
+
+        self._iconPath = iconPath
+        self.setIconImage(QIcon(self._iconPath))
+    
+    def setIconImage(self, icon):
+        """Change the icon of the button from an icon already loaded.
+
+        Args:
+            icon (class: `QIcon`): Icon.
+        """
+        self.button.setText("")
+        self.button.setIcon(icon)
+        self.button.setIconSize(QSize(self._iconScale, self._iconScale))
+
+        # Update widget.
+        self.update()
+    
     def changeButtonStatus(self, status):
         """Change button status.
 